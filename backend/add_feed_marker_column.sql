@@ -0,0 +1,7 @@
+-- Migration: Add feed_marker column to podcasts table
+-- Used by feed_ingestor.py to skip feeds that return a full body on every request (no working
+-- ETag/Last-Modified) but have no new episodes. Holds "<item count>:<first item guid>" taken from
+-- the raw XML; when it matches the last run the feed is not parsed and the episodes are not queried.
+-- Run this in Supabase SQL Editor once. Until then the ingestor runs without the check.
+
+ALTER TABLE public.podcasts ADD COLUMN IF NOT EXISTS feed_marker TEXT;
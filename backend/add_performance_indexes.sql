@@ -36,6 +36,13 @@ CREATE INDEX IF NOT EXISTS idx_podcasts_author_private
 ON podcasts(author, is_private) 
 WHERE is_private = false AND author IS NOT NULL;
 
+-- Trigram index for partial, case-insensitive title matches
+-- Lets ILIKE '%search%' (delete_podcast.py --title) use an index instead of a sequential scan
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_podcasts_title_trgm 
+ON podcasts USING gin (title gin_trgm_ops);
+
 -- ============================================
 -- EPISODES TABLE INDEXES
 -- ============================================
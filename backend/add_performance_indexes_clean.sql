@@ -18,6 +18,11 @@ CREATE INDEX IF NOT EXISTS idx_podcasts_author_private
 ON podcasts(author, is_private) 
 WHERE is_private = false AND author IS NOT NULL;
 
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_podcasts_title_trgm 
+ON podcasts USING gin (title gin_trgm_ops);
+
 -- EPISODES TABLE INDEXES
 CREATE INDEX IF NOT EXISTS idx_episodes_podcast_id 
 ON episodes(podcast_id);
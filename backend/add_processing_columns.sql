@@ -0,0 +1,10 @@
+-- Migration: Add processing_started_at / processing_completed_at columns to podcasts table
+-- Used by feed_ingestor.py to tell feeds an interrupted run left half-stored from feeds that were
+-- simply refreshed recently. processing_started_at is set when the podcast row is upserted and
+-- processing_completed_at once its new episodes are inserted; a feed whose start is newer than its
+-- completion is re-fetched without conditional headers on the next run.
+-- Run this in Supabase SQL Editor once. Until then the ingestor re-fetches feeds refreshed in the
+-- last 10 minutes instead.
+
+ALTER TABLE public.podcasts ADD COLUMN IF NOT EXISTS processing_started_at TIMESTAMPTZ;
+ALTER TABLE public.podcasts ADD COLUMN IF NOT EXISTS processing_completed_at TIMESTAMPTZ;
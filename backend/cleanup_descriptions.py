@@ -3,10 +3,18 @@
 Clean up existing podcast descriptions by removing markdown formatting and title/author prefixes.
 
 This script fixes descriptions that were already enhanced but have markdown formatting issues.
+For the markdown/label part alone, cleanup_descriptions.sql performs the same rewrite as a single
+server-side UPDATE; this script is still needed for the per-podcast title/author prefix strip.
 """
 
 import os
 import re
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from multiprocessing import Pool
+from typing import NamedTuple, Optional
 from supabase import create_client, Client
 from dotenv import load_dotenv
 from rich.console import Console
@@ -24,6 +32,87 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 sb: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 console = Console()
 
+# Number of changed rows sent per upsert request
+UPDATE_BATCH_SIZE = 500
+# Rows per page when streaming podcasts from Supabase
+PAGE_SIZE = 1000
+# Rows handed to each worker process at a time when cleaning a page in parallel
+CLEAN_CHUNK_SIZE = 64
+# Rows between "Processing: ..." progress repaints; updated rows always repaint
+PROGRESS_PAINT_INTERVAL = 50
+# Server-side prefilter: only rows with markdown or a leftover label can need cleanup.
+# A regex (imatch) is used because PostgREST treats '*' in like/ilike patterns as a '%' wildcard.
+CLEANUP_CANDIDATE_PATTERN = "[*]|podcast title:|author:"
+
+# Static patterns compiled once at import instead of on every row
+_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+_ITALIC_RE = re.compile(r'\*(.*?)\*')
+# Horizontal whitespace only, so newlines survive for the paragraph pass below
+_WS_RE = re.compile(r'[^\S\n]+')
+# Any whitespace run containing a newline
+_NEWLINE_RUN_RE = re.compile(r'\s*\n\s*')
+
+
+def _normalize_newlines(match: re.Match) -> str:
+    """Collapse a whitespace run to a paragraph break if it spans a blank line, else to a line break."""
+    return '\n\n' if match.group().count('\n') > 1 else '\n'
+
+
+def _label_re(with_author: bool, with_bold: bool) -> re.Pattern:
+    """Match "Podcast Title:" (and optionally "Author:") labels at the start of any line, optionally wrapped in **...**."""
+    label = r'(?:Podcast Title|Author):' if with_author else r'Podcast Title:'
+    if with_bold:
+        label = r'(?:\*\*' + label + r'\s*.*?\*\*|' + label + r')'
+    return re.compile(r'^\s*' + label + r'\s*', re.IGNORECASE | re.MULTILINE)
+
+
+# Keyed by (with_author, with_bold); the bold-free variants are used once no "**" is left to match
+_LABEL_PATTERNS = {
+    (with_author, with_bold): _label_re(with_author, with_bold)
+    for with_author in (False, True)
+    for with_bold in (False, True)
+}
+
+
+class _TitlePatterns(NamedTuple):
+    """Compiled patterns that depend on a specific podcast title/author."""
+    prefixes: tuple
+    start: re.Pattern
+
+
+@lru_cache(maxsize=4096)
+def _title_patterns(podcast_title: str, author: Optional[str]) -> _TitlePatterns:
+    """Build (once per title/author pair) the patterns used by cleanup_description."""
+    title = re.escape(podcast_title)
+    prefixes = [
+        f"**Podcast Title: {podcast_title}**",
+        f"Podcast Title: {podcast_title}",
+    ]
+    if author:
+        prefixes.extend([
+            f"**Author: {author}**",
+            f"Author: {author}",
+        ])
+        # "Title Author", "Author" or "Title" at the very start of the description
+        start = r'^\s*(?:' + title + r'\s+' + re.escape(author) + '|' + re.escape(author) + '|' + title + r')\s+'
+    else:
+        start = r'^\s*' + title + r'\s+'
+    return _TitlePatterns(
+        prefixes=tuple(prefixes),
+        start=re.compile(start, re.IGNORECASE),
+    )
+
+
+def _strip_repeated(pattern: re.Pattern, text: str, max_passes: Optional[int] = None) -> str:
+    """Apply pattern until it no longer matches (removing one prefix can expose another)."""
+    passes = 0
+    while max_passes is None or passes < max_passes:
+        text, replaced = pattern.subn('', text)
+        if not replaced:
+            break
+        passes += 1
+    return text
+
 
 def cleanup_description(description: str, podcast_title: str, author: str = None) -> str:
     """
@@ -33,121 +122,138 @@ def cleanup_description(description: str, podcast_title: str, author: str = None
         return description
     
     # Remove markdown bold (**text**)
-    description = re.sub(r'\*\*(.*?)\*\*', r'\1', description)
-    description = re.sub(r'\*(.*?)\*', r'\1', description)
+    # Each regex pass is guarded by a plain substring test so already-clean rows skip the regex engine
+    if '**' in description:
+        description = _BOLD_RE.sub(r'\1', description)
+    if '*' in description:
+        description = _ITALIC_RE.sub(r'\1', description)
     
-    # Remove "Podcast Title:" and "Author:" prefixes (with or without markdown)
-    title_pattern = re.compile(r'^\s*\*\*Podcast Title:\s*' + re.escape(podcast_title) + r'\s*\*\*\s*', re.IGNORECASE)
-    description = title_pattern.sub('', description)
+    patterns = _title_patterns(podcast_title, author or None)
+    description_lower = description.lower()
+    has_title_label = 'podcast title:' in description_lower
+    has_author_label = bool(author) and 'author:' in description_lower
     
-    if author:
-        author_pattern = re.compile(r'^\s*\*\*Author:\s*' + re.escape(author) + r'\s*\*\*\s*', re.IGNORECASE)
-        description = author_pattern.sub('', description)
+    # Remove "Podcast Title:" and "Author:" labels (with or without markdown) in one fused pass.
+    # Bold pairs were already stripped above, so the **...** alternatives are usually dead weight.
+    if has_title_label or has_author_label:
+        label_pattern = _LABEL_PATTERNS[(has_author_label, '**' in description)]
+        description = _strip_repeated(label_pattern, description)
     
-    # Remove any remaining "Podcast Title:" or "Author:" patterns
-    description = re.sub(r'^\s*\*\*Podcast Title:\s*.*?\*\*\s*', '', description, flags=re.IGNORECASE | re.MULTILINE)
-    description = re.sub(r'^\s*Podcast Title:\s*.*?\s*', '', description, flags=re.IGNORECASE | re.MULTILINE)
-    if author:
-        description = re.sub(r'^\s*\*\*Author:\s*.*?\*\*\s*', '', description, flags=re.IGNORECASE | re.MULTILINE)
-        description = re.sub(r'^\s*Author:\s*.*?\s*', '', description, flags=re.IGNORECASE | re.MULTILINE)
+    # Remove standalone prefixes (plain literals, so startswith + slice instead of a regex)
+    for prefix in patterns.prefixes:
+        stripped = description.lstrip()
+        if stripped.startswith(prefix):
+            description = stripped[len(prefix):].lstrip()
     
-    # Remove standalone prefixes
-    prefixes_to_remove = [
-        f"**Podcast Title: {podcast_title}**",
-        f"Podcast Title: {podcast_title}",
-    ]
-    if author:
-        prefixes_to_remove.extend([
-            f"**Author: {author}**",
-            f"Author: {author}",
-        ])
-    
-    for prefix in prefixes_to_remove:
-        if description.strip().startswith(prefix):
-            description = description.replace(prefix, "", 1).strip()
-        description = re.sub(re.escape(prefix) + r'\s+', '', description, count=1)
+    # Remove "Title Author", "Author" or "Title" if they appear at the start of the description
+    head = description.lstrip().lower()
+    if head.startswith(podcast_title.lower()) or (author and head.startswith(author.lower())):
+        # Bounded so a title that legitimately repeats is not eaten: "Title Author", "Author", "Title"
+        description = _strip_repeated(patterns.start, description, max_passes=3 if author else 1)
     
-    # NEW: Remove title and author if they appear at the start of the description
-    # Pattern: "Title Author" or "Title  Author" at the beginning
-    if author:
-        # Remove "Title Author" pattern at start
-        pattern = r'^\s*' + re.escape(podcast_title) + r'\s+' + re.escape(author) + r'\s+'
-        description = re.sub(pattern, '', description, flags=re.IGNORECASE)
-        
-        # Also try just author name at start
-        author_pattern = r'^\s*' + re.escape(author) + r'\s+'
-        description = re.sub(author_pattern, '', description, flags=re.IGNORECASE)
-        
-        # And just title at start (if author wasn't there)
-        if not description.strip().startswith(author):
-            title_pattern = r'^\s*' + re.escape(podcast_title) + r'\s+'
-            description = re.sub(title_pattern, '', description, flags=re.IGNORECASE)
-    
-    # Remove title if it appears at start (without author)
-    title_start_pattern = r'^\s*' + re.escape(podcast_title) + r'\s+'
-    description = re.sub(title_start_pattern, '', description, flags=re.IGNORECASE)
-    
-    # Clean up extra whitespace
-    description = re.sub(r'\s+', ' ', description)  # Multiple spaces to single
-    description = re.sub(r'\n\s*\n', '\n\n', description)  # Multiple newlines to double
+    # Clean up extra whitespace (skipped entirely when there is nothing to collapse)
+    if '  ' in description or '\t' in description or '\n' in description or '\r' in description:
+        description = _WS_RE.sub(' ', description)  # Runs of spaces/tabs to single space
+        if '\n' in description:
+            description = _NEWLINE_RUN_RE.sub(_normalize_newlines, description)  # Blank lines to one paragraph break
     description = description.strip()
     
     return description
 
 
-def fetch_all_podcasts():
-    """Fetch all podcasts from Supabase with pagination."""
-    all_podcasts = []
-    page_size = 1000
-    offset = 0
-    
-    while True:
-        result = sb.table("podcasts").select("id,title,author,description").range(offset, offset + page_size - 1).execute()
-        
-        if not result.data:
-            break
-            
-        all_podcasts.extend(result.data)
-        
-        if len(result.data) < page_size:
-            break
-            
-        offset += page_size
-    
-    return all_podcasts
+def _podcasts_query(columns: str, all_rows: bool, **select_kwargs):
+    """Build a podcasts select, restricted to cleanup candidates unless all_rows is set."""
+    query = sb.table("podcasts").select(columns, **select_kwargs)
+    if not all_rows:
+        query = query.filter("description", "imatch", CLEANUP_CANDIDATE_PATTERN)
+    return query
+
+
+def _fetch_page(after_id: Optional[str], all_rows: bool = False) -> list[dict]:
+    """
+    Fetch the page of podcasts that follows after_id.
+    Keyset pagination (id > after_id) instead of offsets: cleaned rows drop out of the
+    candidate filter as they are written back, which would shift every later offset.
+    """
+    query = _podcasts_query("id,feed_url,title,author,description", all_rows)
+    if after_id is not None:
+        query = query.gt("id", after_id)
+    result = query.order("id").limit(PAGE_SIZE).execute()
+    return result.data or []
 
 
-def update_podcast_description(podcast_id: str, cleaned_description: str):
-    """Update podcast description in Supabase."""
-    result = sb.table("podcasts").update({
-        "description": cleaned_description
-    }).eq("id", podcast_id).execute()
-    return result.data[0] if result.data else None
+def count_podcasts(all_rows: bool = False) -> int:
+    """Count the podcasts iter_podcast_pages will yield (used as the progress total)."""
+    result = _podcasts_query("id", all_rows, count="exact").limit(1).execute()
+    return result.count or 0
+
+
+def iter_podcast_pages(all_rows: bool = False):
+    """
+    Stream pages of podcasts from Supabase, so memory stays at O(PAGE_SIZE) rows.
+    The next page is fetched in the background while the current one is being processed.
+    By default only rows whose description contains markdown or a "Podcast Title:"/"Author:" label are returned.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        page = _fetch_page(None, all_rows)
+        while page:
+            next_page = None
+            if len(page) == PAGE_SIZE:
+                next_page = executor.submit(_fetch_page, page[-1]["id"], all_rows)
+            yield page
+            page = next_page.result() if next_page else []
+
+
+def _clean_row(podcast: dict) -> str:
+    """Return the cleaned description for one podcast row. Top-level so worker processes can run it."""
+    description = (podcast.get("description") or "").strip()
+    if not description:
+        return description
+    return cleanup_description(description, podcast.get("title", "Unknown"), podcast.get("author"))
+
+
+def update_podcast_descriptions(changes: list[dict]):
+    """
+    Write a batch of cleaned descriptions to Supabase in a single upsert.
+    Each row carries feed_url because the insert half of the upsert must satisfy its NOT NULL constraint.
+    """
+    if not changes:
+        return []
+    result = sb.table("podcasts").upsert(changes, on_conflict="id").execute()
+    return result.data or []
 
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--all-rows", action="store_true",
+                        help="Scan every podcast, not just rows with markdown or title/author labels")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes used for the regex cleanup (1 = run in this process)")
+    args = parser.parse_args()
+    
     console.print(Panel.fit(
         "[bold cyan]Description Cleanup Tool[/bold cyan]\n"
         "Removing markdown formatting and title/author prefixes",
         border_style="cyan"
     ))
     
-    # Fetch all podcasts
+    # Count podcasts up front; rows are streamed page by page below
     console.print("[cyan]Fetching podcasts from Supabase...[/cyan]")
-    podcasts = fetch_all_podcasts()
+    total = count_podcasts(all_rows=args.all_rows)
     
-    if not podcasts:
+    if not total:
         console.print("[yellow]No podcasts found[/yellow]")
         return
     
-    total = len(podcasts)
     console.print(f"[green]Found {total} podcast(s)[/green]\n")
     
     # Process podcasts
     updated = 0
     unchanged = 0
+    changes = []
     
-    with Progress(
+    # Worker pool is started before the Progress display so no threads exist when it forks
+    with (Pool(processes=args.workers) if args.workers > 1 else nullcontext()) as pool, Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
@@ -155,32 +261,55 @@ def main():
         console=console
     ) as progress:
         task = progress.add_task("[cyan]Cleaning descriptions...", total=total)
+        # Bind hot-loop callables to locals to skip global/attribute lookups per row
+        advance = progress.advance
+        set_description = progress.update
+        clean = _clean_row
+        flush_changes = update_podcast_descriptions
+        queue_change = changes.append
+        rows_since_paint = 0
         
-        for podcast in podcasts:
-            podcast_id = podcast.get("id")
-            title = podcast.get("title", "Unknown")
-            author = podcast.get("author")
-            original_description = podcast.get("description", "").strip()
-            
-            if not original_description:
-                unchanged += 1
-                progress.advance(task)
-                continue
-            
-            progress.update(task, description=f"[cyan]Processing: {title[:50]}...")
-            
-            # Clean description
-            cleaned = cleanup_description(original_description, title, author)
-            
-            # Check if it changed
-            if cleaned != original_description:
-                update_podcast_description(podcast_id, cleaned)
-                updated += 1
-                progress.update(task, description=f"[green]✓ Updated: {title[:50]}...")
+        for page in iter_podcast_pages(all_rows=args.all_rows):
+            # Clean the whole page at once (in parallel when a pool is running)
+            if pool:
+                cleaned_page = pool.map(clean, page, chunksize=CLEAN_CHUNK_SIZE)
             else:
-                unchanged += 1
+                cleaned_page = [clean(podcast) for podcast in page]
             
-            progress.advance(task)
+            for podcast, cleaned in zip(page, cleaned_page):
+                title = podcast.get("title", "Unknown")
+                original_description = (podcast.get("description") or "").strip()
+                
+                if not original_description:
+                    unchanged += 1
+                    advance(task)
+                    continue
+                
+                rows_since_paint += 1
+                if rows_since_paint >= PROGRESS_PAINT_INTERVAL:
+                    set_description(task, description=f"[cyan]Processing: {title[:50]}...")
+                    rows_since_paint = 0
+                
+                # Check if it changed
+                if cleaned != original_description:
+                    queue_change({
+                        "id": podcast.get("id"),
+                        "feed_url": podcast.get("feed_url"),
+                        "description": cleaned,
+                    })
+                    if len(changes) >= UPDATE_BATCH_SIZE:
+                        flush_changes(changes)
+                        changes.clear()
+                    updated += 1
+                    set_description(task, description=f"[green]✓ Updated: {title[:50]}...")
+                    rows_since_paint = 0
+                else:
+                    unchanged += 1
+                
+                advance(task)
+        
+        # Flush the final partial batch
+        flush_changes(changes)
     
     # Summary
     console.print("\n" + "="*60)
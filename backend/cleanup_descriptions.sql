@@ -0,0 +1,48 @@
+-- Cleanup: strip markdown and "Podcast Title:" / "Author:" labels from descriptions in one UPDATE
+-- Server-side equivalent of the markdown, label and whitespace passes in cleanup_descriptions.py:
+-- no per-row round-trips, and rows are never sent to the client.
+-- The "Title Author ..." start-of-description strip depends on each row's own title/author and
+-- still runs through the Python script; labels are also removed in a single pass here, whereas
+-- the script repeats the pass until nothing is left.
+-- Run this in Supabase SQL Editor.
+
+with cleaned as (
+  select
+    id,
+    btrim(
+      regexp_replace(
+        regexp_replace(
+          regexp_replace(
+            regexp_replace(
+              regexp_replace(
+                -- Markdown bold (**text**) and italic (*text*), within a line
+                regexp_replace(description, '\*\*(.*?)\*\*', '\1', 'gn'),
+                '\*(.*?)\*', '\1', 'gn'
+              ),
+              -- "Podcast Title:" (and "Author:" when the podcast has an author) at the start of any line
+              case when coalesce(author, '') <> ''
+                   then '^\s*(Podcast Title|Author):\s*'
+                   else '^\s*Podcast Title:\s*'
+              end,
+              '', 'gin'
+            ),
+            -- Runs of spaces/tabs to a single space
+            '[ \t\r\f\v]+', ' ', 'g'
+          ),
+          -- Blank lines to one paragraph break
+          '\s*\n\s*\n\s*', E'\n\n', 'g'
+        ),
+        -- Trim spaces around single line breaks
+        ' *\n *', E'\n', 'g'
+      ),
+      E' \n'
+    ) as description
+  from public.podcasts
+  -- Same prefilter as CLEANUP_CANDIDATE_PATTERN in cleanup_descriptions.py
+  where description ~* '[*]|podcast title:|author:'
+)
+update public.podcasts p
+set description = c.description
+from cleaned c
+where p.id = c.id
+  and p.description is distinct from c.description;
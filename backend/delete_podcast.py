@@ -9,6 +9,7 @@ Usage examples:
 
 import os
 import sys
+import argparse
 from supabase import create_client
 from dotenv import load_dotenv
 
@@ -31,6 +32,7 @@ def delete_by_feed_url(feed_url: str):
 def delete_by_title(title_search: str, confirm_yes: bool = False):
     """Delete podcasts matching a title search (partial match, case-insensitive)."""
     # First, find what we're about to delete
+    # (served by idx_podcasts_title_trgm from add_performance_indexes.sql for searches of 3+ characters)
     podcasts = sb.table("podcasts").select("id,title,feed_url").ilike("title", f"%{title_search}%").execute()
     
     if not podcasts.data:
@@ -69,7 +71,13 @@ def delete_all():
         print("Cancelled.")
         return
     
-    result = sb.table("podcasts").delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
+    try:
+        # Server-side TRUNCATE (see truncate_podcasts.sql): no per-row deletes and no rows sent back
+        sb.rpc("truncate_podcasts").execute()
+    except Exception as e:
+        print(f"truncate_podcasts() unavailable ({e}); falling back to row-by-row delete.")
+        print("Run backend/truncate_podcasts.sql in Supabase SQL Editor to enable the fast path.")
+        sb.table("podcasts").delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
     print(f"Deleted all podcasts. Episodes were automatically deleted.")
 
 
@@ -90,34 +98,29 @@ def list_podcasts():
         print()
 
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--list", action="store_true", help="List all podcasts")
+    action.add_argument("--feed-url", metavar="URL", help="Delete by feed URL")
+    action.add_argument("--title", metavar="SEARCH", help="Delete by title (partial match)")
+    action.add_argument("--all", action="store_true", help="Delete everything (requires confirmation)")
+    parser.add_argument("--yes", action="store_true", help="Skip confirmation for --title")
+    
     if len(sys.argv) < 2:
-        print(__doc__)
-        print("\nCommands:")
-        print("  --list                List all podcasts")
-        print("  --feed-url URL        Delete by feed URL")
-        print("  --title SEARCH        Delete by title (partial match)")
-        print("  --title SEARCH --yes  Delete by title without confirmation")
-        print("  --all                 Delete everything (requires confirmation)")
+        parser.print_help()
         sys.exit(1)
+    args = parser.parse_args()
     
-    arg = sys.argv[1]
-    confirm_yes = "--yes" in sys.argv
-    
-    if arg == "--list":
+    if args.list:
         list_podcasts()
-    elif arg == "--feed-url" and len(sys.argv) > 2:
-        delete_by_feed_url(sys.argv[2])
-    elif arg == "--title" and len(sys.argv) > 2:
-        title_arg = sys.argv[2] if sys.argv[2] != "--yes" else (sys.argv[3] if len(sys.argv) > 3 else "")
-        if title_arg:
-            delete_by_title(title_arg, confirm_yes)
-        else:
-            print("Error: --title requires a search term")
-            sys.exit(1)
-    elif arg == "--all":
+    elif args.feed_url:
+        delete_by_feed_url(args.feed_url)
+    elif args.title:
+        delete_by_title(args.title, args.yes)
+    elif args.all:
         delete_all()
-    else:
-        print("Invalid arguments. Use --help or see docstring.")
-        sys.exit(1)
 
+
+if __name__ == "__main__":
+    main()
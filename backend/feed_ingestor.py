@@ -1,8 +1,12 @@
+import asyncio
 import csv
+import multiprocessing
+import email.utils
 import os
 import sys
 import time
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from dateutil import parser as dateparser
 import feedparser
@@ -49,11 +53,47 @@ ONLY_DAILY_FEEDS = os.environ.get("ONLY_DAILY_FEEDS", "false").lower() == "true"
 REFRESH_ACTIVE_ONLY = os.environ.get("REFRESH_ACTIVE_ONLY", "true").lower() == "true"
 # Feeds with no new episode in this many days are considered "complete" and skipped on normal runs.
 ACTIVE_DAYS = int(os.environ.get("REFRESH_ACTIVE_DAYS", "60"))
+# Skip parsing feeds whose item count and first guid match the last run (needs add_feed_marker_column.sql;
+# switched off automatically if the column is missing)
+FEED_MARKER_ENABLED = True
+# Track processing_started_at/processing_completed_at per podcast so only feeds an interrupted run left
+# half-stored are re-fetched in full (needs add_processing_columns.sql; until then feeds refreshed in
+# the last 10 minutes are re-fetched instead)
+PROCESSING_FLAGS_ENABLED = True
+# Number of feeds fetched in parallel (the rest of the work is I/O-bound on remote RSS servers)
+FETCH_CONCURRENCY = int(os.environ.get("FETCH_CONCURRENCY", "32"))
+# Fetches in flight to any one host (many feeds live on the same few podcast hosts, which rate-limit bursts)
+FETCH_PER_HOST_CONCURRENCY = int(os.environ.get("FETCH_PER_HOST_CONCURRENCY", "8"))
+# PARSE_WORKERS: Processes parsing feeds in parallel (feedparser is CPU-bound and holds the GIL).
+# Each worker holds one parsed feed at a time. Raw bodies are bounded by FETCH_CONCURRENCY: a feed keeps
+# its fetch slot until its body is parsed or dropped.
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+# Feed URLs per podcasts lookup (kept well under PostgREST's URL length limit)
+FEED_URL_BATCH_SIZE = 200
+# Feed URLs per get_feed_freshness() call (sent in the POST body; at most one row back per URL,
+# kept under Supabase's default max-rows of 1000)
+FRESHNESS_BATCH_SIZE = 1000
+# Podcast ids per batched update (UUIDs, so more fit in a URL than feed URLs)
+PODCAST_ID_BATCH_SIZE = 400
+# Episode guids per existence lookup (kept well under PostgREST's URL length limit)
+GUID_BATCH_SIZE = 200
+# Episode rows per multi-row insert
+EPISODE_INSERT_BATCH_SIZE = 200
+# Connection pool shared by all feed fetches (keep-alive across feeds on the same host)
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30)
+# FETCH_HTTP2: Fetch over HTTP/2 where servers support it; hosts whose HTTP/2 misbehaves fall back to HTTP/1.1
+FETCH_HTTP2 = os.environ.get("FETCH_HTTP2", "true").lower() == "true"
 
 sb: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # --- Helpers ---------------------------------------------------------------
 
+_SLUG_NONWORD = re.compile(r'[^\w\s-]')
+_SLUG_SPACES = re.compile(r'[\s_-]+')
+_SLUG_TRIM = re.compile(r'^-+|-+$')
+_ITUNES_AUTHOR_NS = re.compile(rb'<itunes:author[^>]*>(.*?)</itunes:author>', re.IGNORECASE | re.DOTALL)
+_ITEM_GUID_RE = re.compile(rb'<guid\b[^>]*>([^<]+)</guid>', re.IGNORECASE)
+
 def generate_slug(title: str) -> str:
     """
     Generate URL-friendly slug from title.
@@ -66,13 +106,13 @@ def generate_slug(title: str) -> str:
     slug = title.lower().strip()
     
     # Remove special characters
-    slug = re.sub(r'[^\w\s-]', '', slug)
+    slug = _SLUG_NONWORD.sub('', slug)
     
     # Replace spaces and underscores with hyphens
-    slug = re.sub(r'[\s_-]+', '-', slug)
+    slug = _SLUG_SPACES.sub('-', slug)
     
     # Remove leading/trailing hyphens
-    slug = re.sub(r'^-+|-+$', '', slug)
+    slug = _SLUG_TRIM.sub('', slug)
     
     return slug
 
@@ -91,7 +131,36 @@ def retry_db_operation(func, max_retries=3, base_delay=1):
             raise
     return None
 
-def upsert_podcast(feed_url: str, meta: dict):
+def _fast_parse_date(value: str) -> datetime | None:
+    """
+    Parse a feed date. RSS pubDates are RFC 822 and Atom dates ISO 8601, both handled by
+    the stdlib; dateutil is only the fallback for anything else.
+    """
+    try:
+        dt = email.utils.parsedate_to_datetime(value)
+        # RFC 822 "-0000" means UTC with no known local offset; the stdlib returns it naive
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    except Exception:
+        pass
+    try:
+        return datetime.fromisoformat(value)
+    except Exception:
+        return dateparser.parse(value)
+
+
+def _parse_db_timestamp(value: str) -> datetime:
+    """
+    Parse a timestamp as PostgREST returns it (ISO 8601, written by this script with isoformat()).
+    Naive values are taken as UTC; dateutil is only the fallback for anything fromisoformat rejects.
+    """
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        dt = dateparser.parse(value)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def upsert_podcast(feed_url: str, meta: dict, now_iso: str):
     # Generate slug from title for efficient querying
     title = meta.get("title")
     slug = generate_slug(title) if title else None
@@ -106,8 +175,10 @@ def upsert_podcast(feed_url: str, meta: dict):
         "slug": slug,  # Add slug for efficient querying
         "etag": meta.get("etag"),
         "last_modified": meta.get("last_modified"),
-        "last_refreshed": datetime.utcnow().isoformat()
+        "last_refreshed": now_iso
     }
+    if PROCESSING_FLAGS_ENABLED:
+        data["processing_started_at"] = now_iso
     # Upsert by feed_url with retry
     def _upsert():
         res = sb.table("podcasts").upsert(data, on_conflict="feed_url").execute()
@@ -115,33 +186,47 @@ def upsert_podcast(feed_url: str, meta: dict):
     return retry_db_operation(_upsert)
 
 
-def check_episode_exists(podcast_id: str, guid: str) -> bool:
-    """Check if an episode with the given guid already exists for this podcast."""
-    def _check_exists():
-        return sb.table("episodes").select("id").eq("podcast_id", podcast_id).eq("guid", guid).execute().data
-    
-    exists = retry_db_operation(_check_exists)
-    return bool(exists)
+def mark_feeds_refreshed(podcast_ids: list[str], now_iso: str):
+    """Set last_refreshed for podcasts whose feed was unchanged (304), in batched updates."""
+    for i in range(0, len(podcast_ids), PODCAST_ID_BATCH_SIZE):
+        batch = podcast_ids[i : i + PODCAST_ID_BATCH_SIZE]
+        def _update():
+            return sb.table("podcasts").update({"last_refreshed": now_iso}).in_("id", batch).execute()
+        retry_db_operation(_update)
+
 
+def episode_guid(item: dict) -> str | None:
+    """Identify an episode by id, then guid, then link."""
+    return item.get("id") or item.get("guid") or item.get("link")
 
-def insert_new_episode(podcast_id: str, item: dict) -> bool:
+
+def get_existing_guids(podcast_id: str, guids: list[str]) -> set[str]:
     """
-    Insert a new episode if it doesn't exist.
-    Returns True if inserted, False if it already existed or couldn't be inserted.
+    Return the subset of guids already stored for this podcast.
+    Queries in batches to avoid URL length limits (guids are often full URLs).
     """
-    guid = item.get("id") or item.get("guid") or item.get("link")
-    if not guid:
-        return False
+    guids = [g for g in dict.fromkeys(guids) if g]
+    existing = set()
+    for i in range(0, len(guids), GUID_BATCH_SIZE):
+        batch = guids[i : i + GUID_BATCH_SIZE]
+        def _get_guids():
+            return sb.table("episodes").select("guid").eq("podcast_id", podcast_id).in_("guid", batch).execute().data
+        rows = retry_db_operation(_get_guids) or []
+        existing.update(row["guid"] for row in rows)
+    return existing
 
-    # Check if exists with retry
-    if check_episode_exists(podcast_id, guid):
-        return False
+
+def build_episode(podcast_id: str, item: dict) -> dict | None:
+    """Build the episodes row for a feed item. Returns None if the item has no guid."""
+    guid = episode_guid(item)
+    if not guid:
+        return None
 
     # Parse dates and duration
     pub_date = None
     if item.get("published"):
         try:
-            pub_date = dateparser.parse(item["published"]).isoformat()
+            pub_date = _fast_parse_date(item["published"]).isoformat()
         except Exception:
             pass
 
@@ -149,13 +234,17 @@ def insert_new_episode(podcast_id: str, item: dict) -> bool:
     dur = item.get("itunes_duration") or item.get("duration")
     if dur:
         try:
-            if isinstance(dur, str) and ":" in dur:
+            if not isinstance(dur, str) or dur.isdigit():
+                # Plain seconds (the common case)
+                duration_seconds = int(dur)
+            elif ":" in dur:
                 # hh:mm:ss or mm:ss
-                parts = [int(p) for p in dur.split(":")]
-                if len(parts) == 3:
-                    duration_seconds = parts[0]*3600 + parts[1]*60 + parts[2]
-                elif len(parts) == 2:
-                    duration_seconds = parts[0]*60 + parts[1]
+                h, _, rest = dur.partition(":")
+                m, sep, sec = rest.partition(":")
+                if sep:
+                    duration_seconds = int(h)*3600 + int(m)*60 + int(sec)
+                else:
+                    duration_seconds = int(h)*60 + int(m)
             else:
                 duration_seconds = int(dur)
         except Exception:
@@ -176,159 +265,181 @@ def insert_new_episode(podcast_id: str, item: dict) -> bool:
         "duration_seconds": duration_seconds,
         "image_url": (item.get("image") or {}).get("href") if isinstance(item.get("image"), dict) else None,
     }
-    # Insert with retry, catch unique constraint violations
-    try:
-        def _insert():
-            sb.table("episodes").insert(ep).execute()
-        retry_db_operation(_insert)
-        return True
-    except Exception as e:
-        # Check if it's a unique constraint violation (PostgreSQL error code 23505)
-        # Supabase may expose error code in different ways
-        error_str = str(e)
-        error_code = None
-        
-        # Try to get error code from exception attributes
-        if hasattr(e, 'code'):
-            error_code = str(e.code)
-        elif hasattr(e, 'message') and isinstance(e.message, dict):
-            error_code = str(e.message.get('code', ''))
-        elif hasattr(e, 'args') and len(e.args) > 0 and isinstance(e.args[0], dict):
-            error_code = str(e.args[0].get('code', ''))
-        
-        # Check for unique constraint violation
-        if (error_code == '23505' or 
-            '23505' in error_str or 
-            'duplicate key' in error_str.lower() or 
-            'unique constraint' in error_str.lower()):
-            # Episode already exists - return False (no new insert)
-            return False
-        # Re-raise other exceptions
-        raise
-
-
-def fetch_and_process(feed_url: str, etag: str | None, last_modified: str | None, genre_override: str | None = None):
+    return ep
+
+
+def insert_episodes_bulk(podcast_id: str, items: list) -> int:
+    """
+    Insert new episodes with one multi-row upsert per batch. Episodes already stored
+    (e.g. by a concurrent run since the guid lookup) are skipped by the database.
+    Returns the number of episodes inserted.
+    """
+    eps = []
+    seen = set()
+    for item in items:
+        ep = build_episode(podcast_id, item)
+        # Feeds occasionally repeat a guid; keep the first like the database would
+        if ep and ep["guid"] not in seen:
+            seen.add(ep["guid"])
+            eps.append(ep)
+
+    inserted = 0
+    for i in range(0, len(eps), EPISODE_INSERT_BATCH_SIZE):
+        batch = eps[i : i + EPISODE_INSERT_BATCH_SIZE]
+        # ON CONFLICT DO NOTHING: only rows actually inserted come back (also makes retries safe)
+        def _insert_batch():
+            return sb.table("episodes").upsert(batch, on_conflict="podcast_id,guid", ignore_duplicates=True).execute().data
+        inserted += len(retry_db_operation(_insert_batch) or [])
+    return inserted
+
+
+class FeedClient:
+    """
+    Pooled client for feed fetches. Uses HTTP/2 where the server offers it (multiplexed,
+    compressed headers, one connection per host) and falls back to HTTP/1.1 per host
+    once a server's HTTP/2 fails with a protocol error.
+    gzip/deflate/br response compression is negotiated by httpx automatically.
+    """
+
+    def __init__(self):
+        # Enable redirect following; HTTP/1.1 client is the fallback for hosts with broken HTTP/2
+        self.client = httpx.AsyncClient(timeout=20, http2=FETCH_HTTP2, follow_redirects=True, limits=HTTP_LIMITS)
+        self.http1_client = httpx.AsyncClient(timeout=20, http2=False, follow_redirects=True, limits=HTTP_LIMITS)
+        self.http1_hosts: set[str] = set()
+        self.host_sems: dict[str, asyncio.Semaphore] = {}
+
+    def host_slot(self, url: str) -> asyncio.Semaphore:
+        """Semaphore capping concurrent fetches to the url's host."""
+        host = httpx.URL(url).host
+        sem = self.host_sems.get(host)
+        if sem is None:
+            sem = self.host_sems[host] = asyncio.Semaphore(FETCH_PER_HOST_CONCURRENCY)
+        return sem
+
+    async def get(self, url: str, headers: dict, skip_body=None) -> httpx.Response:
+        """
+        GET url. skip_body(response) is checked once the headers are in; if it returns True
+        the body is never downloaded and the response is returned without content.
+        """
+        host = httpx.URL(url).host
+        if FETCH_HTTP2 and host not in self.http1_hosts:
+            try:
+                return await self._get(self.client, url, headers, skip_body)
+            except (httpx.RemoteProtocolError, httpx.LocalProtocolError):
+                self.http1_hosts.add(host)
+        return await self._get(self.http1_client, url, headers, skip_body)
+
+    @staticmethod
+    async def _get(client: httpx.AsyncClient, url: str, headers: dict, skip_body) -> httpx.Response:
+        r = await client.send(client.build_request("GET", url, headers=headers), stream=True)
+        try:
+            if not (skip_body and skip_body(r)):
+                await r.aread()
+        finally:
+            await r.aclose()
+        return r
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+        await self.http1_client.aclose()
+
+
+async def fetch_feed(client: FeedClient, fetch_sem: asyncio.Semaphore, feed_url: str,
+                     etag: str | None, last_modified: str | None):
+    """
+    GET a feed with conditional headers.
+    Returns (status_code, content, headers); content is None when the feed is unchanged
+    (304, or a 200 carrying the same ETag/Last-Modified as last time).
+    On return the caller holds a fetch_sem slot and must release it once done with the body
+    (on error it is released here), so at most FETCH_CONCURRENCY bodies are in memory.
+    """
     headers = {}
     if etag:
         headers["If-None-Match"] = etag
     if last_modified:
         headers["If-Modified-Since"] = last_modified
 
-    # Use httpx to get raw RSS with conditional headers
-    # Use HTTP/1.1 to avoid HTTP/2 connection issues, and enable redirect following
-    with httpx.Client(timeout=20, http2=False, follow_redirects=True) as client:
-        r = client.get(feed_url, headers=headers)
-        if r.status_code == 304:
-            return None, []  # unchanged
-        r.raise_for_status()
-        content = r.content
-        etag_new = r.headers.get("ETag")
-        lm_new = r.headers.get("Last-Modified")
+    def unchanged(r: httpx.Response) -> bool:
+        # Some servers ignore If-None-Match/If-Modified-Since but still send the same validators -
+        # don't download a body we already have
+        return r.status_code == 200 and bool(
+            (etag and r.headers.get("ETag") == etag)
+            or (last_modified and r.headers.get("Last-Modified") == last_modified)
+        )
+
+    # Host slot first, so feeds queued behind a busy host don't hold global slots
+    async with client.host_slot(feed_url):
+        await fetch_sem.acquire()
+        try:
+            r = await client.get(feed_url, headers=headers, skip_body=unchanged)
+            if r.status_code == 304 or unchanged(r):
+                return r.status_code, None, r.headers  # unchanged
+            r.raise_for_status()
+        except BaseException:
+            fetch_sem.release()
+            raise
+    return r.status_code, r.content, r.headers
+
 
+def _walk_genres(node):
+    """Yield genre names from a category node: a string, a dict (term/label/text plus nested
+    "category" subcategories) or a list of either."""
+    if isinstance(node, str):
+        yield node
+    elif isinstance(node, dict):
+        yield node.get("term") or node.get("label") or node.get("text")
+        yield from _walk_genres(node.get("category"))
+    elif isinstance(node, list):
+        for n in node:
+            yield from _walk_genres(n)
+
+
+def parse_feed_bytes(content: bytes, etag: str | None, last_modified: str | None, genre_override: str | None = None):
+    """Parse raw feed bytes into (meta, items). etag/last_modified are stored with the podcast as-is."""
     parsed = feedparser.parse(content)
     
-    # Extract itunes:author directly from XML (feedparser doesn't always handle namespaced fields)
-    # Try to extract from raw XML content
+    # feedparser folds <itunes:author> into "author" together with managingEditor/dc:creator
+    # (last one wins) and never sets itunes_author, so read the channel's itunes:author from XML.
+    # The channel header before the first <item> is scanned first; the rest of the body only
+    # when the channel has no itunes:author of its own.
     itunes_author = None
     try:
-        # Look for <itunes:author> or <itunes_author> tags
-        itunes_author_match = re.search(
-            rb'<itunes:author[^>]*>(.*?)</itunes:author>',
-            content,
-            re.IGNORECASE | re.DOTALL
-        )
-        if not itunes_author_match:
-            # Try without namespace (some feeds use <itunes_author>)
-            itunes_author_match = re.search(
-                rb'<itunes_author[^>]*>(.*?)</itunes_author>',
-                content,
-                re.IGNORECASE | re.DOTALL
-            )
+        header_end = content.find(b"<item")
+        itunes_author_match = _ITUNES_AUTHOR_NS.search(content, 0, header_end if header_end != -1 else len(content))
+        if not itunes_author_match and header_end != -1:
+            # Some feeds only tag episodes - fall back to the first episode's author (feed.author may
+            # just be a managingEditor/dc:creator, so it doesn't count)
+            itunes_author_match = _ITUNES_AUTHOR_NS.search(content, header_end)
         if itunes_author_match:
             itunes_author = itunes_author_match.group(1).decode('utf-8').strip()
     except Exception:
         # If extraction fails, continue without it
         pass
 
-    # Extract ALL genres from iTunes category or categories
-    genres = []
-    
-    def extract_genre_from_item(item):
-        """Extract genre name from a category item (dict or string)"""
-        if isinstance(item, dict):
-            return item.get("term") or item.get("label") or item.get("text")
-        elif isinstance(item, str):
-            return item
-        return None
-    
-    def extract_nested_genres(cat_item):
-        """Recursively extract genres from nested category structures"""
-        extracted = []
-        if isinstance(cat_item, dict):
-            # Top-level category
-            top_genre = extract_genre_from_item(cat_item)
-            if top_genre:
-                extracted.append(top_genre)
-            # Check for nested categories (subcategories)
-            if "category" in cat_item:
-                nested = cat_item["category"]
-                if isinstance(nested, list):
-                    for n in nested:
-                        nested_genre = extract_genre_from_item(n)
-                        if nested_genre:
-                            extracted.append(nested_genre)
-                else:
-                    nested_genre = extract_genre_from_item(nested)
-                    if nested_genre:
-                        extracted.append(nested_genre)
-        elif isinstance(cat_item, str):
-            extracted.append(cat_item)
-        return extracted
-    
-    itunes_cats = parsed.feed.get("itunes_category")
-    if itunes_cats:
-        if isinstance(itunes_cats, list):
-            # Multiple categories - extract all of them
-            for cat in itunes_cats:
-                genres.extend(extract_nested_genres(cat))
-        elif isinstance(itunes_cats, dict):
-            # Single category - extract it and any nested ones
-            genres.extend(extract_nested_genres(itunes_cats))
-    
-    # Also check tags field (common in RSS feeds, may have additional genres)
-    tags = parsed.feed.get("tags")
-    if tags:
-        if isinstance(tags, list):
-            for tag in tags:
-                # Tags can be dicts with 'term', 'label', or just strings
-                if isinstance(tag, dict):
-                    tag_term = tag.get("term") or tag.get("label")
-                    if tag_term:
-                        genres.append(tag_term)
-                elif isinstance(tag, str):
-                    genres.append(tag)
-        elif isinstance(tags, str):
-            genres.append(tags)
+    # Extract ALL genres from iTunes category or categories (also covers additional genres in tags)
+    genres = [
+        g for src in (parsed.feed.get("itunes_category"), parsed.feed.get("tags"))
+        for g in _walk_genres(src) if g
+    ]
     
     # Fallback to categories field if still not found
     if not genres:
         cats = parsed.feed.get("categories")
         if cats:
             if isinstance(cats, list):
-                for cat in cats:
-                    cat_str = cat if isinstance(cat, str) else str(cat)
-                    if cat_str:
-                        genres.append(cat_str)
+                genres = [cat if isinstance(cat, str) else str(cat) for cat in cats]
             elif isinstance(cats, str):
-                genres.append(cats)
+                genres = [cats]
     
-    # Remove duplicates while preserving order
-    seen = set()
-    genres_unique = []
+    # Remove duplicates (case-insensitive, first spelling wins) while preserving order
+    unique = {}
     for g in genres:
-        if g and g.lower() not in seen:
-            seen.add(g.lower())
-            genres_unique.append(g)
+        if g:
+            unique.setdefault(g.lower(), g)
+    genres_unique = list(unique.values())
     
     # Use CSV override if provided (can be comma-separated for multiple)
     if genre_override:
@@ -340,26 +451,47 @@ def fetch_and_process(feed_url: str, etag: str | None, last_modified: str | None
 
     meta = {
         "title": parsed.feed.get("title"),
-        # Prioritize itunes:author extracted from XML, then feedparser's itunes_author, then fallback to author
-        "author": itunes_author or parsed.feed.get("itunes_author") or parsed.feed.get("author"),
+        # Prioritize itunes:author extracted from XML, then feedparser's author (also covers <itunes_author>)
+        "author": itunes_author or parsed.feed.get("author") or (parsed.feed.get("author_detail") or {}).get("name"),
         "image_url": (parsed.feed.get("image") or {}).get("href") if isinstance(parsed.feed.get("image"), dict) else parsed.feed.get("itunes_image"),
         "description": parsed.feed.get("subtitle") or parsed.feed.get("description"),
         "genre": genre,
-        "etag": etag_new or etag,
-        "last_modified": lm_new or last_modified,
+        "etag": etag,
+        "last_modified": last_modified,
     }
-    items = parsed.entries or []
+    # Plain dicts with just the stored fields: results are pickled back from the parse worker
+    items = [_lean_entry(entry) for entry in parsed.entries or []]
     return meta, items
 
 
+def _lean_entry(entry) -> dict:
+    """Copy the entry fields episode_guid()/build_episode() read out of a FeedParserDict."""
+    enclosures = entry.get("enclosures") or []
+    image = entry.get("image")
+    return {
+        "id": entry.get("id"),
+        "guid": entry.get("guid"),
+        "link": entry.get("link"),
+        "title": entry.get("title"),
+        "summary": entry.get("summary"),
+        "published": entry.get("published"),
+        "itunes_duration": entry.get("itunes_duration"),
+        "duration": entry.get("duration"),
+        "enclosures": [{"href": enclosures[0].get("href")}] if enclosures else [],
+        "image": {"href": image.get("href")} if isinstance(image, dict) else None,
+    }
+
+
 # --- Main -----------------------------------------------------------------
 
 def read_csv_feeds(path: str):
     """Read feeds from CSV, optionally with genre override and daily flag.
     Returns list of tuples: (feed_url, genre_override or None, is_daily: bool).
     is_daily is True when the row has a 'daily' column set to 1, true, yes, or daily.
+    A feed_url listed more than once keeps its first row, so it isn't processed twice.
     """
     feeds = []
+    seen = set()
     daily_candidates = ["daily", "Daily", "DAILY", "frequency", "Frequency"]
     daily_truthy = {"1", "true", "yes", "daily", "day"}
     with open(path, newline="", encoding="utf-8") as f:
@@ -390,49 +522,97 @@ def read_csv_feeds(path: str):
                         is_daily = True
                     break
 
-            if feed_url:
+            if feed_url and feed_url not in seen:
+                seen.add(feed_url)
                 feeds.append((feed_url, genre_override, is_daily))
     return feeds
 
 
-def get_existing_etags(feed_url: str):
-    """Get existing etag, last_modified, podcast_id, and last_refreshed timestamp."""
-    def _get_etags():
-        return sb.table("podcasts").select("etag,last_modified,id,last_refreshed").eq("feed_url", feed_url).limit(1).execute().data
-    row = retry_db_operation(_get_etags)
-    if row:
-        return (
-            row[0].get("etag"),
-            row[0].get("last_modified"),
-            row[0].get("id"),
-            row[0].get("last_refreshed")
-        )
-    return None, None, None, None
+def _feed_state_columns() -> str:
+    columns = "feed_url,etag,last_modified,id,last_refreshed"
+    if FEED_MARKER_ENABLED:
+        columns += ",feed_marker"
+    if PROCESSING_FLAGS_ENABLED:
+        columns += ",processing_started_at,processing_completed_at"
+    return columns
 
 
-def has_new_episodes(podcast_id: str, items: list, force_check: bool = False) -> bool:
+def preload_feed_state(feed_urls: list[str]) -> dict[str, dict]:
     """
-    Check if any of the items are new episodes (not already in database).
-    
-    Args:
-        podcast_id: The podcast ID
-        items: List of episode items from the feed
-        force_check: If True, always return True (force processing)
+    Get existing etag, last_modified, id, last_refreshed, feed_marker and processing timestamps
+    for all feeds up front. Returns {feed_url: row}; feeds not in the DB are absent.
+    Optional columns that don't exist yet are dropped and their feature switched off.
+    """
+    global FEED_MARKER_ENABLED, PROCESSING_FLAGS_ENABLED
+    columns = _feed_state_columns()
+    state = {}
+    i = 0
+    while i < len(feed_urls):
+        batch = feed_urls[i : i + FEED_URL_BATCH_SIZE]
+        def _get_state():
+            return sb.table("podcasts").select(columns).in_("feed_url", batch).execute().data
+        try:
+            rows = retry_db_operation(_get_state) or []
+        except Exception as e:
+            if FEED_MARKER_ENABLED and "feed_marker" in str(e):
+                print(f"feed_marker column unavailable ({e}); unchanged-feed detection by guid is off.")
+                print("Run backend/add_feed_marker_column.sql in Supabase SQL Editor to enable it.")
+                FEED_MARKER_ENABLED = False
+            elif PROCESSING_FLAGS_ENABLED and "processing_" in str(e):
+                print(f"processing_* columns unavailable ({e}); re-fetching feeds refreshed in the last 10 minutes instead.")
+                print("Run backend/add_processing_columns.sql in Supabase SQL Editor to enable interrupted-feed tracking.")
+                PROCESSING_FLAGS_ENABLED = False
+            else:
+                raise
+            columns = _feed_state_columns()
+            continue
+        for row in rows:
+            state[row["feed_url"]] = row
+        i += FEED_URL_BATCH_SIZE
+    return state
+
+
+def feed_marker(content: bytes) -> str | None:
+    """
+    Cheap change marker for feeds that don't honor conditional GET: "<item count>:<first item guid>",
+    taken from the raw XML without parsing. Returns None if the feed has no items or guids.
+    A new episode changes the marker whether the feed lists newest or oldest first.
+    """
+    first_item = content.find(b"<item")
+    if first_item == -1:
+        return None
+    match = _ITEM_GUID_RE.search(content, first_item)
+    if not match:
+        return None
+    try:
+        guid = match.group(1).decode("utf-8").strip()
+    except UnicodeDecodeError:
+        return None
+    return f"{content.count(b'<item')}:{guid}"
+
+
+def mark_feed_stored(podcast_id: str, fields: dict):
+    """Store processing_completed_at and/or the feed marker once the feed's episodes are in the database."""
+    def _update():
+        return sb.table("podcasts").update(fields).eq("id", podcast_id).execute()
+    retry_db_operation(_update)
+
+
+def was_interrupted(row: dict) -> bool:
+    """
+    Check if the last run that stored this feed started but never finished it
+    (processing_started_at set, processing_completed_at missing or older).
     """
-    if not items or not podcast_id:
+    started = row.get("processing_started_at")
+    if not started:
         return False
-    
-    if force_check:
+    completed = row.get("processing_completed_at")
+    if not completed:
         return True
-    
-    # Sample check: check first few items to see if any are new
-    # If we find new ones, we'll process all. If not, we skip.
-    sample_size = min(5, len(items))
-    for item in items[:sample_size]:
-        guid = item.get("id") or item.get("guid") or item.get("link")
-        if guid and not check_episode_exists(podcast_id, guid):
-            return True
-    return False
+    try:
+        return _parse_db_timestamp(completed) < _parse_db_timestamp(started)
+    except Exception:
+        return True  # can't tell - re-fetch to be safe
 
 
 def was_recently_refreshed(last_refreshed_str: str | None, threshold_minutes: int = 10) -> bool:
@@ -444,29 +624,22 @@ def was_recently_refreshed(last_refreshed_str: str | None, threshold_minutes: in
         return False
     
     try:
-        last_refreshed = dateparser.parse(last_refreshed_str)
-        now = datetime.utcnow()
+        last_refreshed = _parse_db_timestamp(last_refreshed_str)
+        now = datetime.now(timezone.utc)
         time_diff = (now - last_refreshed).total_seconds() / 60  # Convert to minutes
         return time_diff < threshold_minutes
     except Exception:
         return False
 
 
-def get_active_feed_urls(csv_feed_urls: list[str]) -> set[str]:
+def _get_feed_freshness_batched(csv_feed_urls: list[str]) -> dict | None:
     """
-    Return set of feed_urls that should be refreshed this run:
-    - New feeds (in CSV but not in DB)
-    - Feeds where the latest episode pub_date is within ACTIVE_DAYS (still "active")
-    Skips feeds that have no new episode in ACTIVE_DAYS (considered complete/inactive).
-    Uses batched queries to avoid URL length limits.
+    Fallback for get_feed_freshness(): latest episode pub_date per known feed via batched
+    podcasts + episodes aggregate queries. Returns None if the aggregate isn't available.
     """
-    if not csv_feed_urls:
-        return set()
-    csv_set = set(csv_feed_urls)
-    cutoff = datetime.utcnow() - timedelta(days=ACTIVE_DAYS)
-
-    # Batch size for IN clauses (avoid 414 URI too long)
-    batch_size = 400
+    # Batch sizes for IN clauses (avoid 414 URI too long)
+    feed_url_batch_size = FEED_URL_BATCH_SIZE
+    podcast_id_batch_size = PODCAST_ID_BATCH_SIZE
 
     def _get_podcasts_batch(urls_batch):
         return retry_db_operation(
@@ -480,10 +653,7 @@ def get_active_feed_urls(csv_feed_urls: list[str]) -> set[str]:
         for row in rows:
             feed_to_id[row["feed_url"]] = row["id"]
 
-    new_feeds = csv_set - set(feed_to_id.keys())
     podcast_ids = list(feed_to_id.values())
-    if not podcast_ids:
-        return new_feeds
 
     # Get max(pub_date) per podcast_id from episodes (PostgREST: group by non-aggregate column)
     id_to_latest = {}
@@ -508,18 +678,54 @@ def get_active_feed_urls(csv_feed_urls: list[str]) -> set[str]:
             # If aggregate not supported or fails, treat all as active (process all)
             console = Console()
             console.print(f"[yellow]Could not get latest episode dates ({e}), processing all feeds[/yellow]")
+            return None
+
+    return {feed_url: id_to_latest.get(pid) for feed_url, pid in feed_to_id.items()}
+
+
+def get_active_feed_urls(csv_feed_urls: list[str]) -> set[str]:
+    """
+    Return set of feed_urls that should be refreshed this run:
+    - New feeds (in CSV but not in DB)
+    - Feeds where the latest episode pub_date is within ACTIVE_DAYS (still "active")
+    Skips feeds that have no new episode in ACTIVE_DAYS (considered complete/inactive).
+    Uses one get_feed_freshness() RPC call, or batched queries if the function isn't installed.
+    """
+    if not csv_feed_urls:
+        return set()
+    csv_set = set(csv_feed_urls)
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=ACTIVE_DAYS)
+
+    try:
+        # Server-side join + max() (see get_feed_freshness.sql). Batched only so each response
+        # stays under PostgREST's max-rows cap, which also applies to set-returning RPCs.
+        feed_to_latest = {}
+        for i in range(0, len(csv_feed_urls), FRESHNESS_BATCH_SIZE):
+            batch = csv_feed_urls[i : i + FRESHNESS_BATCH_SIZE]
+            res = retry_db_operation(
+                lambda: sb.rpc("get_feed_freshness", {"urls": batch}).execute()
+            )
+            for row in res.data or []:
+                feed_to_latest[row["feed_url"]] = row.get("latest")
+    except Exception as e:
+        console = Console()
+        console.print(f"[yellow]get_feed_freshness() unavailable ({e}); falling back to batched queries.[/yellow]")
+        console.print("[yellow]Run backend/get_feed_freshness.sql in Supabase SQL Editor to enable the fast path.[/yellow]")
+        feed_to_latest = _get_feed_freshness_batched(csv_feed_urls)
+        if feed_to_latest is None:
             return csv_set
 
+    new_feeds = csv_set - set(feed_to_latest.keys())
+
     active_feeds = set()
-    for feed_url, pid in feed_to_id.items():
-        latest = id_to_latest.get(pid)
+    for feed_url, latest in feed_to_latest.items():
         # Process if: no episodes yet (latest is None) or latest episode is within ACTIVE_DAYS
         if latest is None:
             active_feeds.add(feed_url)
         else:
             try:
                 if isinstance(latest, str):
-                    latest_dt = dateparser.parse(latest)
+                    latest_dt = _parse_db_timestamp(latest)
                 else:
                     latest_dt = latest
                 if latest_dt:
@@ -536,7 +742,7 @@ def get_active_feed_urls(csv_feed_urls: list[str]) -> set[str]:
     return new_feeds | active_feeds
 
 
-def delete_podcasts_not_in_csv(csv_feed_urls: set[str]):
+def delete_podcasts_not_in_csv(csv_feed_urls: frozenset[str]):
     """
     Delete podcasts from database whose feed_url is not in the CSV.
     Returns the number of podcasts deleted.
@@ -562,24 +768,192 @@ def delete_podcasts_not_in_csv(csv_feed_urls: set[str]):
     if not podcasts_to_delete:
         return 0
     
-    # Delete podcasts not in CSV (episodes cascade automatically)
+    # Delete podcasts not in CSV (episodes cascade automatically), one request per batch
     deleted_count = 0
-    for feed_url in podcasts_to_delete:
+    for i in range(0, len(podcasts_to_delete), FEED_URL_BATCH_SIZE):
+        batch = podcasts_to_delete[i : i + FEED_URL_BATCH_SIZE]
         try:
             def _delete():
-                return sb.table("podcasts").delete().eq("feed_url", feed_url).execute()
+                return sb.table("podcasts").delete().in_("feed_url", batch).execute()
             retry_db_operation(_delete)
-            deleted_count += 1
+            deleted_count += len(batch)
         except Exception as e:
-            # Log error but continue deleting others
-            print(f"Error deleting podcast {feed_url}: {e}")
+            # Log error but continue deleting other batches
+            print(f"Error deleting {len(batch)} podcast(s) ({batch[0]}, ...): {e}")
     
     return deleted_count
 
 
+def store_feed(feed_url: str, meta: dict, items: list, force_episode_check: bool, now_iso: str,
+               marker: str | None = None, known_marker: str | None = None) -> int | None:
+    """
+    Upsert podcast metadata (always, even if no new episodes) and insert new episodes.
+    Returns the number of episodes inserted, or None if the feed had no new episodes.
+    """
+    podcast_row = upsert_podcast(feed_url, meta, now_iso)
+    podcast_id = podcast_row["id"]
+
+    # One lookup for the whole feed instead of one per episode
+    item_guids = [episode_guid(item) for item in items]
+    existing = get_existing_guids(podcast_id, item_guids)
+    new_items = [item for item, guid in zip(items, item_guids) if guid and guid not in existing]
+    if not new_items and not force_episode_check:
+        episode_count = None
+    else:
+        # Process episodes - only new ones are left
+        episode_count = insert_episodes_bulk(podcast_id, new_items)
+
+    # Saved last, so a run that fails mid-feed makes the next run re-fetch it instead of skipping it
+    done = {}
+    if PROCESSING_FLAGS_ENABLED:
+        done["processing_completed_at"] = now_iso
+    if FEED_MARKER_ENABLED and marker and marker != known_marker:
+        done["feed_marker"] = marker
+    if done:
+        mark_feed_stored(podcast_id, done)
+    return episode_count
+
+
+async def process_feed(client: FeedClient, fetch_sem: asyncio.Semaphore, parse_sem: asyncio.Semaphore,
+                       parse_pool: ProcessPoolExecutor, feed_url: str, genre_override: str | None, state: dict, now_iso: str, counts: dict,
+                       unchanged_ids: list, progress: Progress, task):
+    """Fetch, parse and store one feed, updating counts and the progress bar."""
+    loop = asyncio.get_running_loop()
+    try:
+        # Existing podcast info (preloaded) if available
+        row = state.get(feed_url, {})
+        etag, last_modified, podcast_id = row.get("etag"), row.get("last_modified"), row.get("id")
+        last_refreshed, known_marker = row.get("last_refreshed"), row.get("feed_marker")
+
+        # Check if the last run was interrupted while storing this feed
+        if PROCESSING_FLAGS_ENABLED:
+            interrupted = was_interrupted(row)
+        else:
+            interrupted = was_recently_refreshed(last_refreshed)
+
+        # If interrupted (or FORCE_REFRESH), force re-fetch to catch any missed episodes
+        if interrupted and not FORCE_REFRESH:
+            progress.update(task, description=f"[yellow]Re-processing (was interrupted): {feed_url[:60]}...")
+        refetch = interrupted or FORCE_REFRESH
+        if refetch:
+            # Force fetch by not sending conditional headers
+            etag, last_modified = None, None
+
+        status, content, headers = await fetch_feed(client, fetch_sem, feed_url, etag, last_modified)
+
+        # The fetch slot stays held until the body is parsed or dropped
+        try:
+            # Skip if feed hasn't changed (304 Not Modified); last_refreshed is updated in one batch at the end
+            if content is None:
+                if podcast_id:
+                    unchanged_ids.append(podcast_id)
+                counts["skipped"] += 1
+                progress.update(
+                    task,
+                    advance=1,
+                    description=f"[yellow]Skipped (unchanged): {feed_url[:60]}...",
+                    skipped=counts["skipped"]
+                )
+                return
+
+            # Same item count and first guid as last run: nothing new even though the body came back (no ETag support)
+            marker = feed_marker(content) if FEED_MARKER_ENABLED else None
+            if marker and marker == known_marker and not refetch:
+                unchanged_ids.append(podcast_id)
+                counts["skipped"] += 1
+                progress.update(
+                    task,
+                    advance=1,
+                    description=f"[yellow]Skipped (same episodes): {feed_url[:60]}...",
+                    skipped=counts["skipped"]
+                )
+                return
+
+            # Parse in a worker process so other fetches keep flowing and feeds parse in parallel
+            async with parse_sem:
+                meta, items = await loop.run_in_executor(
+                    parse_pool,
+                    parse_feed_bytes,
+                    content,
+                    headers.get("ETag") or etag,
+                    headers.get("Last-Modified") or last_modified,
+                    genre_override,
+                )
+            # Don't hold the raw body while the episodes are stored
+            del content, headers
+        finally:
+            # Frees room for the next body
+            fetch_sem.release()
+
+        episode_count = await asyncio.to_thread(store_feed, feed_url, meta, items, refetch, now_iso, marker, known_marker)
+
+        if episode_count is None:
+            # Feed updated but no new episodes - podcast metadata was still updated
+            counts["skipped"] += 1
+            progress.update(
+                task,
+                advance=1,
+                description=f"[yellow]Skipped (no new episodes): {feed_url[:60]}...",
+                skipped=counts["skipped"]
+            )
+            return
+
+        counts["new_eps"] += episode_count
+        counts["processed"] += 1
+        progress.update(
+            task,
+            advance=1,
+            description=f"[green]✓ Processed: {feed_url[:50]}... ({episode_count} new)",
+            processed=counts["processed"],
+            new_eps=counts["new_eps"]
+        )
+
+    except Exception as e:
+        counts["errors"] += 1
+        import traceback
+        error_msg = f"[red]✗ Error: {feed_url[:50]}... - {str(e)[:40]}"
+        progress.update(
+            task,
+            advance=1,
+            description=error_msg,
+            errors=counts["errors"]
+        )
+        progress.console.print(f"[red]Error processing {feed_url}:[/red] {e}")
+        if os.environ.get("DEBUG", "false").lower() == "true":
+            progress.console.print(traceback.format_exc())
+
+
+async def process_all(feeds_to_process: list[tuple[str, str | None]], state: dict, now_iso: str,
+                      progress: Progress, task) -> dict:
+    """Process all feeds concurrently over one pooled client. Returns processed/skipped/errors/new_eps counts."""
+    counts = {"processed": 0, "skipped": 0, "errors": 0, "new_eps": 0}
+    unchanged_ids = []
+    fetch_sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+    # At most one body queued per worker; fetched bodies wait here (still holding their fetch slot)
+    # rather than in the pool's queue
+    parse_sem = asyncio.Semaphore(PARSE_WORKERS)
+    # spawn, not fork: the event loop's worker threads may hold locks when a worker process starts
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")) as parse_pool:
+        async with FeedClient() as client:
+            await asyncio.gather(*(
+                process_feed(client, fetch_sem, parse_sem, parse_pool, feed_url, genre_override, state, now_iso,
+                             counts, unchanged_ids, progress, task)
+                for feed_url, genre_override in feeds_to_process
+            ))
+    if unchanged_ids:
+        try:
+            await asyncio.to_thread(mark_feeds_refreshed, unchanged_ids, now_iso)
+        except Exception as e:
+            progress.console.print(f"[yellow]Could not update last_refreshed for unchanged feeds: {e}[/yellow]")
+    return counts
+
+
 def run_once():
     console = Console()
+    # One timestamp for the whole run, so every feed touched by it gets the same last_refreshed
+    now_iso = datetime.now(timezone.utc).isoformat()
     all_feeds = read_csv_feeds(CSV_PATH)
+    all_feed_urls = frozenset(f[0] for f in all_feeds)
     feeds = all_feeds
     if ONLY_DAILY_FEEDS:
         feeds = [f for f in feeds if f[2]]
@@ -610,11 +984,10 @@ def run_once():
     # Normalize to (feed_url, genre_override) for the loop
     feeds_to_process = [(f[0], f[1]) for f in feeds_to_process]
     total_feeds = len(feeds_to_process)
-    
-    processed = 0
-    skipped = 0
-    errors = 0
-    new_episodes_added = 0
+
+    # Get existing podcast info for every feed in a few batched queries
+    # (also with FORCE_REFRESH: it checks which optional columns exist before anything is written)
+    state = preload_feed_state([f[0] for f in feeds_to_process])
 
     with Progress(
         SpinnerColumn(),
@@ -631,7 +1004,8 @@ def run_once():
         TimeElapsedColumn(),
         TimeRemainingColumn(),
         console=console,
-        expand=True
+        expand=True,
+        refresh_per_second=10
     ) as progress:
         task = progress.add_task(
             "[cyan]Processing feeds...",
@@ -642,105 +1016,19 @@ def run_once():
             new_eps=0
         )
 
-        for feed_url, genre_override in feeds_to_process:
-            try:
-                progress.update(task, description=f"[cyan]Processing: {feed_url[:60]}...")
-                
-                # Get existing podcast info if available
-                if FORCE_REFRESH:
-                    etag, last_modified, podcast_id, last_refreshed = None, None, None, None
-                else:
-                    etag, last_modified, podcast_id, last_refreshed = get_existing_etags(feed_url)
-                
-                # Check if feed was recently refreshed (could indicate interrupted processing)
-                recently_refreshed = was_recently_refreshed(last_refreshed)
-                
-                # If recently refreshed, force re-fetch to catch any missed episodes
-                if recently_refreshed and not FORCE_REFRESH:
-                    progress.update(task, description=f"[yellow]Re-processing (was interrupted): {feed_url[:60]}...")
-                    # Force fetch by not sending conditional headers
-                    meta, items = fetch_and_process(feed_url, None, None, genre_override)
-                else:
-                    # Fetch and process feed normally
-                    meta, items = fetch_and_process(feed_url, etag, last_modified, genre_override)
-                
-                # Skip if feed hasn't changed (304 Not Modified) and wasn't recently refreshed
-                if meta is None and not recently_refreshed:
-                    skipped += 1
-                    progress.update(
-                        task,
-                        advance=1,
-                        description=f"[yellow]Skipped (unchanged): {feed_url[:60]}...",
-                        skipped=skipped
-                    )
-                    time.sleep(0.05)
-                    continue
-
-                # Upsert podcast metadata (always update even if no new episodes)
-                podcast_row = upsert_podcast(feed_url, meta)
-                podcast_id = podcast_row["id"]
-                
-                # Check if there are any new episodes before processing
-                # Force processing if recently refreshed (might have been interrupted) or FORCE_REFRESH
-                force_episode_check = recently_refreshed or FORCE_REFRESH
-                if not force_episode_check and not has_new_episodes(podcast_id, items, force_check=False):
-                    # Feed updated but no new episodes - skip processing episodes
-                    # Podcast metadata was still updated above
-                    skipped += 1
-                    progress.update(
-                        task,
-                        advance=1,
-                        description=f"[yellow]Skipped (no new episodes): {feed_url[:60]}...",
-                        skipped=skipped
-                    )
-                    time.sleep(0.05)
-                    continue
-                
-                # If recently refreshed, indicate we're re-processing to catch missed episodes
-                if recently_refreshed:
-                    progress.update(task, description=f"[cyan]Re-processing episodes (catch-up): {feed_url[:60]}...")
-
-                # Process episodes - only new ones will be inserted
-                episode_count = 0
-                for item in items:
-                    if insert_new_episode(podcast_id, item):
-                        episode_count += 1
-                
-                new_episodes_added += episode_count
-                processed += 1
-                
-                status_msg = f"[green]✓ Processed: {feed_url[:50]}... ({episode_count} new)"
-                progress.update(
-                    task,
-                    advance=1,
-                    description=status_msg,
-                    processed=processed,
-                    new_eps=new_episodes_added
-                )
-                time.sleep(0.05)
-                
-            except Exception as e:
-                errors += 1
-                import traceback
-                error_msg = f"[red]✗ Error: {feed_url[:50]}... - {str(e)[:40]}"
-                progress.update(
-                    task,
-                    advance=1,
-                    description=error_msg,
-                    errors=errors
-                )
-                console.print(f"[red]Error processing {feed_url}:[/red] {e}")
-                if os.environ.get("DEBUG", "false").lower() == "true":
-                    console.print(traceback.format_exc())
-                time.sleep(0.05)
+        counts = asyncio.run(process_all(feeds_to_process, state, now_iso, progress, task))
+
+    processed = counts["processed"]
+    skipped = counts["skipped"]
+    errors = counts["errors"]
+    new_episodes_added = counts["new_eps"]
 
     # Delete podcasts not in CSV (if enabled)
     deleted_count = 0
     if DELETE_MISSING and not (BATCH_SIZE and BATCH_SIZE > 0) and not ONLY_DAILY_FEEDS:
         # Only delete missing when processing full CSV (not batch or daily-only mode)
         console.print(f"\n[yellow]Checking for podcasts to delete...[/yellow]")
-        csv_feed_urls = {f[0] for f in all_feeds}
-        deleted_count = delete_podcasts_not_in_csv(csv_feed_urls)
+        deleted_count = delete_podcasts_not_in_csv(all_feed_urls)
         if deleted_count > 0:
             console.print(f"[red]Deleted {deleted_count} podcast(s) not in CSV[/red]")
         else:
@@ -3,22 +3,35 @@
 Fix podcast descriptions that end in "..." (truncated descriptions).
 
 This script:
-1. Fetches all podcasts from Supabase
+1. Streams podcasts from Supabase page by page
 2. Finds descriptions that end in "..."
 3. Rewrites them using OpenAI to complete the description
 4. Updates Supabase with the complete descriptions
 
 Usage:
-    python3 fix_truncated_descriptions.py [--dry-run] [--limit N]
+    python3 fix_truncated_descriptions.py [--dry-run] [--limit N] [--title T] [--concurrency N] [--no-cache] [--semantic-cache]
+                                          [--local-repair] [--model M] [--creative] [--max-rpm N] [--max-tpm N]
+    python3 fix_truncated_descriptions.py --batch            # submit via the Batch API and wait for results
+    python3 fix_truncated_descriptions.py --batch-id BATCH   # collect a batch submitted earlier
 """
 
 import os
 import re
+import json
 import time
+import hashlib
+import sqlite3
+import random
+import asyncio
 import argparse
-from typing import Optional
-from openai import OpenAI
-from supabase import create_client, Client
+from functools import lru_cache
+from typing import NamedTuple, Optional
+import httpx
+import numpy as np
+import openai
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from postgrest.utils import SyncClient
+from supabase import create_client, Client, ClientOptions
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn, MofNCompleteColumn
@@ -36,13 +49,316 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 if not OPENAI_API_KEY:
     raise ValueError("OPENAI_API_KEY must be set in .env")
 
+# Supabase (PostgREST) HTTP settings. Page fetches and upserts run from several threads at once,
+# so the pool keeps enough warm keep-alive connections for all of them to skip TLS handshakes.
+SUPABASE_TIMEOUT = 30
+SUPABASE_MAX_CONNECTIONS = 20
+SUPABASE_KEEPALIVE_EXPIRY = 30
+
+
+def _pool_postgrest_session(client: Client):
+    """
+    supabase-py 2.6 has no option for the PostgREST HTTP client, so replace its session with one
+    that has the same settings plus a sized connection pool. (The Supabase transaction pooler is for
+    direct Postgres connections; over the REST API, PostgREST pools database connections itself.)
+    """
+    session = client.postgrest.session
+    client.postgrest.session = SyncClient(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=session.timeout,
+        follow_redirects=True,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=SUPABASE_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_MAX_CONNECTIONS,
+            keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY,
+        ),
+    )
+    session.close()
+
+
 # Initialize clients
-sb: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-openai_client = OpenAI(api_key=OPENAI_API_KEY)
+sb: Client = create_client(SUPABASE_URL, SUPABASE_KEY, options=ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT))
+_pool_postgrest_session(sb)
 console = Console()
 
-# Rate limiting: delay between API calls (seconds)
-API_DELAY = 0.5
+# Maximum number of OpenAI requests in flight at once
+CONCURRENCY = 20
+# Connection pool for the OpenAI client. httpx defaults to 100 connections / 20 keep-alive,
+# which throttles high --concurrency runs on pool contention; keep the pool well above it.
+MAX_CONNECTIONS = 200
+MAX_KEEPALIVE_CONNECTIONS = 100
+# OpenAI rate limits for the account tier (gpt-4o-mini, tier 1); override with --max-rpm / --max-tpm
+MAX_REQUESTS_PER_MINUTE = 500
+MAX_TOKENS_PER_MINUTE = 200_000
+# Attempts per OpenAI request before giving up on transient (429/5xx/network) errors
+MAX_ATTEMPTS = 5
+# Local response cache so re-runs don't pay for identical requests again
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".openai_cache.sqlite")
+# Batch API mode (--batch): 50% cheaper, results within 24h. OpenAI caps a batch at 50,000 requests.
+BATCH_MAX_REQUESTS = 50_000
+BATCH_POLL_INTERVAL = 60  # seconds between status checks
+BATCH_INPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fix_truncated_batch.jsonl")
+# Rows per page when streaming podcasts from Supabase
+PAGE_SIZE = 1000
+PODCAST_COLUMNS = "id,feed_url,title,author,description"
+# Id ranges paged concurrently when streaming podcasts
+FETCH_SHARDS = 8
+# Server-side filter matching is_truncated, so only candidate rows leave the database (POSIX regex)
+TRUNCATED_PATTERN = r"\.\.\.\s*$"
+# Podcasts buffered between the page fetcher and the OpenAI workers
+QUEUE_SIZE = 200
+# Completed descriptions are written to Supabase in batches of this many rows per upsert
+UPDATE_BATCH_SIZE = 500
+# Completions not yet confirmed written to Supabase; replayed at the start of the next run after a crash
+CHECKPOINT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".fix_truncated_checkpoint.jsonl")
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_THRESHOLD = 0.95
+# Chat model for completions; override with --model
+MODEL = "gpt-4o-mini"
+# With --local-repair, a long truncated description that already reads like an enhanced one (says who
+# it's for / why to listen) is fixed by cutting it back to its last complete sentence instead of calling
+# the model: only if the description is LOCAL_REPAIR_MIN_CHARS-LOCAL_REPAIR_MAX_INPUT_CHARS long and the
+# cut keeps at least LOCAL_REPAIR_MIN_CHARS (and at most LOCAL_REPAIR_MAX_CHARS, the model's own limit)
+LOCAL_REPAIR_MIN_CHARS = 800
+LOCAL_REPAIR_MAX_CHARS = 1000
+LOCAL_REPAIR_MAX_INPUT_CHARS = 1800
+# Stop streaming a completion after this many characters; finish_completion keeps at most 1000
+STREAM_MAX_CHARS = 1200
+# Deterministic output by default (and so cacheable); --creative restores the old sampling temperature
+TEMPERATURE = 0
+CREATIVE_TEMPERATURE = 0.7
+
+# Retries are handled by stream_chat_completion so backoff and Retry-After stay in one place
+openai_client = AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    max_retries=0,
+    http_client=DefaultAsyncHttpxClient(
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS)
+    ),
+)
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for OpenAI's requests-per-minute and tokens-per-minute budgets.
+    Both buckets refill continuously; a request waits only until enough capacity exists,
+    instead of sleeping a fixed delay between every call.
+    """
+    
+    def __init__(self, max_requests_per_minute: float, max_tokens_per_minute: float):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_request_capacity = float(max_requests_per_minute)
+        self.available_token_capacity = float(max_tokens_per_minute)
+        self.last_update_time = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_update_time
+        self.last_update_time = now
+        self.available_request_capacity = min(
+            self.max_requests_per_minute,
+            self.available_request_capacity + elapsed * self.max_requests_per_minute / 60,
+        )
+        self.available_token_capacity = min(
+            self.max_tokens_per_minute,
+            self.available_token_capacity + elapsed * self.max_tokens_per_minute / 60,
+        )
+    
+    async def acquire(self, estimated_tokens: int):
+        """Wait until one request and estimated_tokens tokens are available, then consume them."""
+        estimated_tokens = min(estimated_tokens, self.max_tokens_per_minute)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.available_request_capacity >= 1 and self.available_token_capacity >= estimated_tokens:
+                    self.available_request_capacity -= 1
+                    self.available_token_capacity -= estimated_tokens
+                    return
+                request_deficit = 1 - self.available_request_capacity
+                token_deficit = estimated_tokens - self.available_token_capacity
+                await asyncio.sleep(max(
+                    request_deficit * 60 / self.max_requests_per_minute,
+                    token_deficit * 60 / self.max_tokens_per_minute,
+                    0.01,
+                ))
+    
+    def reconcile(self, estimated_tokens: int, actual_tokens: int):
+        """Return (or charge) the difference between the estimate and the actual usage."""
+        self._refill()
+        self.available_token_capacity = min(
+            self.max_tokens_per_minute,
+            self.available_token_capacity + estimated_tokens - actual_tokens,
+        )
+
+
+class ResponseCache:
+    """
+    SQLite cache of OpenAI completions.
+    Exact tier: SHA-256 of the full request (model, messages, temperature, max_tokens).
+    Optional semantic tier: prompt embeddings; a near-duplicate prompt (cosine >= threshold) reuses its response.
+    """
+    
+    def __init__(self, path: str = CACHE_PATH, semantic: bool = False, threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, embedding BLOB NOT NULL, response TEXT NOT NULL)")
+        self.conn.commit()
+        self.semantic = semantic
+        self.threshold = threshold
+        self.hits = 0
+        self.semantic_hits = 0
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._vector_responses: list[str] = []
+        if semantic:
+            rows = self.conn.execute("SELECT embedding, response FROM embeddings").fetchall()
+            if rows:
+                self._vectors = np.vstack([np.frombuffer(blob, dtype=np.float32) for blob, _ in rows])
+                self._vector_responses = [response for _, response in rows]
+    
+    @staticmethod
+    def key(**request) -> str:
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row:
+            self.hits += 1
+            return row[0]
+        return None
+    
+    def set(self, key: str, response: str, embedding: Optional[np.ndarray] = None):
+        self.conn.execute("INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)", (key, response))
+        if embedding is not None:
+            self.conn.execute("INSERT OR REPLACE INTO embeddings (key, embedding, response) VALUES (?, ?, ?)",
+                              (key, embedding.tobytes(), response))
+            self._vectors = embedding[None, :] if not self._vector_responses else np.vstack([self._vectors, embedding])
+            self._vector_responses.append(response)
+        self.conn.commit()
+    
+    async def embed(self, text: str) -> np.ndarray:
+        """Unit-normalised embedding, so cosine similarity is a dot product."""
+        result = await openai_client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+        vector = np.asarray(result.data[0].embedding, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+    
+    def nearest(self, embedding: np.ndarray) -> Optional[str]:
+        if not self._vector_responses:
+            return None
+        scores = self._vectors @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            self.semantic_hits += 1
+            return self._vector_responses[best]
+        return None
+    
+    def close(self):
+        self.conn.close()
+
+
+def estimate_tokens(messages: list[dict], max_tokens: int) -> int:
+    """Rough token estimate for a request: ~4 characters per prompt token plus the full completion budget."""
+    return sum(len(m["content"]) for m in messages) // 4 + max_tokens
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the Retry-After header (seconds) from an OpenAI error response, if present."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    """429s, 5xx responses, timeouts and connection errors are transient; other 4xx are not."""
+    if isinstance(error, (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+async def stream_chat_completion(max_chars: int, max_attempts: int = MAX_ATTEMPTS, **kwargs) -> tuple[str, Optional[int]]:
+    """
+    Stream a chat completion and return (text, total tokens if reported).
+    Reading stops once more than max_chars have arrived, since finish_completion discards
+    anything past its length limit anyway; closing the stream stops generation of the rest.
+    Transient failures are retried with exponential backoff (1s, 2s, 4s, 8s plus jitter);
+    a Retry-After header from the server takes precedence.
+    """
+    for attempt in range(max_attempts):
+        try:
+            stream = await openai_client.chat.completions.create(
+                stream=True, stream_options={"include_usage": True}, **kwargs
+            )
+            parts = []
+            length = 0
+            total_tokens = None
+            async for chunk in stream:
+                if chunk.usage:
+                    total_tokens = chunk.usage.total_tokens
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    length += len(parts[-1])
+                    if length > max_chars:
+                        await stream.close()
+                        break
+            return "".join(parts), total_tokens
+        except Exception as e:
+            if not _is_retryable(e) or attempt == max_attempts - 1:
+                raise
+            delay = _retry_after_seconds(e)
+            if delay is None:
+                delay = 2 ** attempt + random.random()
+            console.print(f"[yellow]OpenAI request failed ({e.__class__.__name__}), retrying in {delay:.1f}s "
+                          f"(attempt {attempt + 2}/{max_attempts})[/yellow]")
+            await asyncio.sleep(delay)
+
+
+# Static patterns compiled once at import instead of on every call
+_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+_ITALIC_RE = re.compile(r'\*(.*?)\*')
+_BOLD_TITLE_LABEL_RE = re.compile(r'^\s*\*\*Podcast Title:\s*.*?\*\*\s*', re.IGNORECASE | re.MULTILINE)
+_TITLE_LABEL_RE = re.compile(r'^\s*Podcast Title:\s*.*?\s*', re.IGNORECASE | re.MULTILINE)
+_BOLD_AUTHOR_LABEL_RE = re.compile(r'^\s*\*\*Author:\s*.*?\*\*\s*', re.IGNORECASE | re.MULTILINE)
+_AUTHOR_LABEL_RE = re.compile(r'^\s*Author:\s*.*?\s*', re.IGNORECASE | re.MULTILINE)
+
+
+class _TitlePatterns(NamedTuple):
+    """Compiled patterns that depend on a specific podcast title/author."""
+    bold_title: re.Pattern
+    bold_author: Optional[re.Pattern]
+    # (prefix, prefix-followed-by-space pattern, prefix-on-its-own-line pattern)
+    prefixes: tuple
+    title_author_start: Optional[re.Pattern]
+    author_start: Optional[re.Pattern]
+    title_start: re.Pattern
+
+
+@lru_cache(maxsize=4096)
+def _title_patterns(podcast_title: str, author: Optional[str]) -> _TitlePatterns:
+    """Build (once per title/author pair) the patterns used by cleanup_description."""
+    title = re.escape(podcast_title)
+    escaped_author = re.escape(author) if author else None
+    prefixes = [f"**Podcast Title: {podcast_title}**", f"Podcast Title: {podcast_title}"]
+    if author:
+        prefixes += [f"**Author: {author}**", f"Author: {author}"]
+    return _TitlePatterns(
+        bold_title=re.compile(r'^\s*\*\*Podcast Title:\s*' + title + r'\s*\*\*\s*', re.IGNORECASE),
+        bold_author=re.compile(r'^\s*\*\*Author:\s*' + escaped_author + r'\s*\*\*\s*', re.IGNORECASE) if author else None,
+        prefixes=tuple(
+            (prefix, re.compile(re.escape(prefix) + r'\s+'), re.compile(re.escape(prefix) + r'\s*\n'))
+            for prefix in prefixes
+        ),
+        title_author_start=re.compile(r'^\s*' + title + r'\s+' + escaped_author + r'\s+', re.IGNORECASE) if author else None,
+        author_start=re.compile(r'^\s*' + escaped_author + r'\s+', re.IGNORECASE) if author else None,
+        title_start=re.compile(r'^\s*' + title + r'\s+', re.IGNORECASE),
+    )
 
 
 def cleanup_description(description: str, podcast_title: str, author: Optional[str] = None) -> str:
@@ -52,74 +368,82 @@ def cleanup_description(description: str, podcast_title: str, author: Optional[s
     if not description:
         return description
     
-    # Remove markdown bold (**text**) - handle both single and double asterisks
-    description = re.sub(r'\*\*(.*?)\*\*', r'\1', description)
-    description = re.sub(r'\*(.*?)\*', r'\1', description)
+    # Each pass below is skipped when the literal text it needs ("*", "**", ":") is absent, so
+    # clean model output usually only sees the title/author start strips and one whitespace pass
     
-    # Remove common prefixes (with or without markdown)
-    prefixes_to_remove = []
+    # Remove markdown bold (**text**) - handle both single and double asterisks
+    if '*' in description:
+        description = _BOLD_RE.sub(r'\1', description)
+        description = _ITALIC_RE.sub(r'\1', description)
+    has_bold = '**' in description
     
-    # Add variations with markdown
-    prefixes_to_remove.append(f"**Podcast Title: {podcast_title}**")
-    prefixes_to_remove.append(f"Podcast Title: {podcast_title}")
-    if author:
-        prefixes_to_remove.append(f"**Author: {author}**")
-        prefixes_to_remove.append(f"Author: {author}")
+    patterns = _title_patterns(podcast_title, author)
     
     # Also remove if title/author appear in the pattern at the start
     # Pattern: **Podcast Title: Title** **Author: Author** or similar
-    title_pattern = re.compile(r'^\s*\*\*Podcast Title:\s*' + re.escape(podcast_title) + r'\s*\*\*\s*', re.IGNORECASE)
-    description = title_pattern.sub('', description)
+    if has_bold:
+        description = patterns.bold_title.sub('', description)
+        if author:
+            description = patterns.bold_author.sub('', description)
     
-    if author:
-        author_pattern = re.compile(r'^\s*\*\*Author:\s*' + re.escape(author) + r'\s*\*\*\s*', re.IGNORECASE)
-        description = author_pattern.sub('', description)
-    
-    # Remove standalone prefixes
-    for prefix in prefixes_to_remove:
-        if prefix:
-            # Remove at start (with or without leading space)
-            if description.strip().startswith(prefix):
-                description = description.replace(prefix, "", 1).strip()
-            # Remove if followed by space
-            description = re.sub(re.escape(prefix) + r'\s+', '', description, count=1)
-            # Remove if on its own line
-            description = re.sub(re.escape(prefix) + r'\s*\n', '\n', description, count=1)
+    # Remove standalone prefixes (with or without markdown); every step needs the literal prefix, so skip absent ones
+    for prefix, followed_by_space, own_line in patterns.prefixes:
+        if prefix not in description:
+            continue
+        # Remove at start (with or without leading space)
+        if description.strip().startswith(prefix):
+            description = description.replace(prefix, "", 1).strip()
+        # Remove if followed by space
+        description = followed_by_space.sub('', description, count=1)
+        # Remove if on its own line
+        description = own_line.sub('\n', description, count=1)
     
     # Remove any remaining "Podcast Title:" or "Author:" patterns
-    description = re.sub(r'^\s*\*\*Podcast Title:\s*.*?\*\*\s*', '', description, flags=re.IGNORECASE | re.MULTILINE)
-    description = re.sub(r'^\s*Podcast Title:\s*.*?\s*', '', description, flags=re.IGNORECASE | re.MULTILINE)
-    if author:
-        description = re.sub(r'^\s*\*\*Author:\s*.*?\*\*\s*', '', description, flags=re.IGNORECASE | re.MULTILINE)
-        description = re.sub(r'^\s*Author:\s*.*?\s*', '', description, flags=re.IGNORECASE | re.MULTILINE)
+    if ':' in description:
+        # Re-checked because the prefix passes can join two stray asterisks
+        has_bold = '**' in description
+        if has_bold:
+            description = _BOLD_TITLE_LABEL_RE.sub('', description)
+        description = _TITLE_LABEL_RE.sub('', description)
+        if author:
+            if has_bold:
+                description = _BOLD_AUTHOR_LABEL_RE.sub('', description)
+            description = _AUTHOR_LABEL_RE.sub('', description)
     
     # Remove title and author if they appear at the start of the description
     if author:
         # Remove "Title Author" pattern at start
-        pattern = r'^\s*' + re.escape(podcast_title) + r'\s+' + re.escape(author) + r'\s+'
-        description = re.sub(pattern, '', description, flags=re.IGNORECASE)
+        description = patterns.title_author_start.sub('', description)
         
         # Also try just author name at start
-        author_pattern = r'^\s*' + re.escape(author) + r'\s+'
-        description = re.sub(author_pattern, '', description, flags=re.IGNORECASE)
+        description = patterns.author_start.sub('', description)
         
         # And just title at start (if author wasn't there)
         if not description.strip().lower().startswith(author.lower()):
-            title_pattern = r'^\s*' + re.escape(podcast_title) + r'\s+'
-            description = re.sub(title_pattern, '', description, flags=re.IGNORECASE)
+            description = patterns.title_start.sub('', description)
     
     # Remove title if it appears at start (without author)
-    title_start_pattern = r'^\s*' + re.escape(podcast_title) + r'\s+'
-    description = re.sub(title_start_pattern, '', description, flags=re.IGNORECASE)
+    description = patterns.title_start.sub('', description)
     
-    # Clean up extra whitespace and newlines
-    description = re.sub(r'\s+', ' ', description)  # Multiple spaces to single
-    description = re.sub(r'\n\s*\n', '\n\n', description)  # Multiple newlines to double
-    description = description.strip()
+    # Clean up extra whitespace; this also flattens newlines, so the text ends up a single paragraph
+    # (str.split() splits on exactly the characters \s matches)
+    description = ' '.join(description.split())
     
     return description
 
 
+# Common URL patterns (more specific to avoid false positives), as one alternation
+_LINK_RE = re.compile(
+    r'http[s]?://[^\s]+'  # http:// or https:// followed by non-whitespace
+    r'|www\.[^\s]+'  # www. followed by non-whitespace
+    r'|[a-zA-Z0-9-]+\.(?:com|org|net|edu|io|co\.uk|gov|tv|me|info)[^\s]*',  # domain.com, domain.org, etc.
+    re.IGNORECASE,
+)
+# URLs stripped from generated descriptions
+_HTTP_URL_RE = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+_WWW_URL_RE = re.compile(r'www\.(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
+
 def has_links(text: str) -> bool:
     """
     Check if text contains URLs or links.
@@ -127,87 +451,57 @@ def has_links(text: str) -> bool:
     if not text:
         return False
     
-    # Common URL patterns (more specific to avoid false positives)
-    url_patterns = [
-        r'http[s]?://[^\s]+',  # http:// or https:// followed by non-whitespace
-        r'www\.[^\s]+',         # www. followed by non-whitespace
-        r'[a-zA-Z0-9-]+\.(?:com|org|net|edu|io|co\.uk|gov|tv|me|info)[^\s]*',  # domain.com, domain.org, etc.
-    ]
-    
-    text_lower = text.lower()
-    for pattern in url_patterns:
-        if re.search(pattern, text_lower):
-            return True
-    
-    return False
+    # IGNORECASE instead of lowercasing a copy of the whole text
+    return _LINK_RE.search(text) is not None
 
 
-def complete_description(truncated_description: str, podcast_title: str, author: Optional[str] = None) -> str:
-    """
-    Complete a truncated description that ends in "...".
-    
-    Args:
-        truncated_description: The truncated description ending in "..."
-        podcast_title: The podcast title for context
-        author: Optional author name
-    
-    Returns:
-        Complete description
-    """
-    # Check if description contains links - if so, rewrite completely from scratch
-    contains_links = has_links(truncated_description)
-    
-    if contains_links:
-        # If description has links, create completely new description from title/author only
-        console.print(f"[yellow]Found links in description - rewriting from scratch based on title/author[/yellow]")
-        base_description = ""  # Don't use the old description at all
-        use_existing = False
-    else:
-        # Remove the trailing "..." to get the base description
-        base_description = truncated_description.rstrip('.').rstrip().rstrip('.')
-        use_existing = True
-    
-    # Determine podcast type based on title and description
-    title_lower = podcast_title.lower()
-    desc_lower = (base_description or "").lower()
-    
-    is_audiobook = any(keyword in title_lower or keyword in desc_lower 
-                      for keyword in ['book', 'novel', 'story', 'tale', 'classic', 'literature'])
-    is_sleep = any(keyword in title_lower or keyword in desc_lower 
-                  for keyword in ['sleep', 'sleeping', 'relax', 'meditation', 'ambient', 'white noise', 'rain', 'ocean', 'nature sounds'])
-    is_public_domain = any(keyword in title_lower or keyword in desc_lower 
-                          for keyword in ['public domain', 'classic', 'vintage', 'old time', 'historical'])
-    
-    # Build context about podcast type
-    type_context = []
-    if is_audiobook:
-        type_context.append("audiobook adaptation")
-    if is_sleep:
-        type_context.append("sleep/relaxation content")
-    if is_public_domain:
-        type_context.append("public domain work")
-    if not type_context:
-        type_context.append("audio content")
-    
-    type_note = ", ".join(type_context) if type_context else "audio content"
-    
-    if use_existing:
-        # Complete existing truncated description
-        prompt = f"""Complete and enhance this truncated podcast description. The description was cut off mid-sentence and ends with "...". 
+# Characters of a description scanned for content-type keywords
+CLASSIFY_CHARS = 4096
+# Content-type keywords, matched as substrings of the lowercased title and description
+_TYPE_KEYWORDS = {
+    "audiobook adaptation": ['book', 'novel', 'story', 'tale', 'classic', 'literature'],
+    "sleep/relaxation content": ['sleep', 'sleeping', 'relax', 'meditation', 'ambient', 'white noise', 'rain', 'ocean', 'nature sounds'],
+    "public domain work": ['public domain', 'classic', 'vintage', 'old time', 'historical'],
+}
+# keyword -> every type it signals ('classic' signals two)
+_KEYWORD_TYPES = {
+    keyword: {t for t, keywords in _TYPE_KEYWORDS.items() if keyword in keywords}
+    for keywords in _TYPE_KEYWORDS.values() for keyword in keywords
+}
+# One pass over the text for every keyword. The lookahead matches at each position, so overlapping
+# keywords are all seen, exactly like checking `keyword in text` for each one.
+_TYPE_KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(sorted(map(re.escape, _KEYWORD_TYPES), key=len, reverse=True)) + '))'
+)
 
-Podcast Title: {podcast_title}
-{f'Author: {author}' if author else ''}
-Type: {type_note}
 
-Truncated description:
-{base_description}...
+def classify_podcast_type(podcast_title: str, description: Optional[str]) -> str:
+    """Describe the content type ("audiobook adaptation, public domain work", ...) from title/description keywords."""
+    # The keywords are short and the opening of a description says what it is, so only the first
+    # CLASSIFY_CHARS are lowercased and scanned. A newline can't occur in any keyword, so no match
+    # spans the title/description boundary.
+    text = f"{podcast_title.lower()}\n{(description or '')[:CLASSIFY_CHARS].lower()}"
+    found: set[str] = set()
+    for match in _TYPE_KEYWORD_RE.finditer(text):
+        found |= _KEYWORD_TYPES[match.group(1)]
+        if len(found) == len(_TYPE_KEYWORDS):
+            break
+    return ", ".join(t for t in _TYPE_KEYWORDS if t in found) or "audio content"
+
+
+# Static instructions shared by every request. Keeping them in the system message (and the per-podcast
+# data at the end of the user message) gives all requests an identical prefix that OpenAI caches automatically.
+SYSTEM_PROMPT = """You are an expert writer specializing in clear, warm, confident podcast descriptions. You write single-paragraph descriptions (500-1000 characters) that accurately reflect themes and tone, explain why someone would want to listen, state who it's for, and use SEO-friendly terms naturally. You avoid hype, filler, spoilers, and dramatic language. Your style is clear, warm, and confident - never sensational.
+
+Each request gives you a podcast title, an optional author, a content type and one of two tasks:
+- "complete the truncated description": the description was cut off mid-sentence and ends with "...". Complete and enhance it.
+- "write a new description from the title and author": there is no usable description. Create one from the title and author alone.
 
 Write a compelling description that:
 
 1. **Accurately reflects the book's themes and tone:**
-   - Complete the thought that was cut off naturally
-   - Continue seamlessly from where it left off
-   - Stay true to the themes and tone established in the truncated portion
+   - When completing: complete the thought that was cut off naturally, continue seamlessly from where it left off, and stay true to the themes and tone established in the truncated portion
+   - When writing a new description: based on the title and author, determine what this content is about, match the appropriate tone for this type of content, and be accurate to what the book/podcast actually contains
 
 2. **Explains why someone would want to listen:**
    - What makes this content valuable or engaging
@@ -225,6 +519,7 @@ Write a compelling description that:
    - Avoid dramatic or sensational language
    - Don't oversell or use excessive adjectives
    - Don't reveal major plot points
+   - Be accurate and truthful about the content
 
 6. **Style:**
    - Clear, warm, confident tone
@@ -239,154 +534,505 @@ Write a compelling description that:
    - Do NOT end with "..." - write a complete, finished description
    - Single paragraph - no line breaks
    - NO URLs or links - write a clean description without any web addresses
+   - Be accurate to the actual content - don't make up details
 
-Write a polished, complete description in a single flowing paragraph:"""
-    else:
-        # Create completely new description from title/author only
-        prompt = f"""Create a compelling podcast description based on the podcast title and author.
+Reply with only the polished, complete description in a single flowing paragraph."""
 
-Podcast Title: {podcast_title}
-{f'Author: {author}' if author else ''}
-Type: {type_note}
 
-Write a compelling description that:
+def _prompt_base(truncated_description: str) -> str:
+    """The part of a truncated description the prompt builds on: none if it has links, else the text minus its "..."."""
+    if has_links(truncated_description):
+        return ""
+    return truncated_description.rstrip('.').rstrip().rstrip('.')
 
-1. **Accurately reflects the book's themes and tone:**
-   - Based on the title and author, determine what this content is about
-   - Match the appropriate tone for this type of content
-   - Be accurate to what the book/podcast actually contains
 
-2. **Explains why someone would want to listen:**
-   - What makes this content valuable or engaging
-   - What listeners will gain from the experience
+def classify_page(page: list[dict]) -> list[dict]:
+    """
+    Tag each podcast in a page with its content type ("_type_note").
+    Runs in the page-fetch thread, so classification stays off the event loop driving the OpenAI calls.
+    """
+    for podcast in page:
+        base_description = _prompt_base((podcast.get("description") or "").strip())
+        podcast["_type_note"] = classify_podcast_type(podcast.get("title", "Unknown"), base_description)
+    return page
 
-3. **States who the book is for:**
-   - Who would enjoy this content
-   - What type of listener it appeals to
 
-4. **Uses SEO-friendly search terms naturally:**
-   - Include genre, historical period, themes naturally
-   - Don't keyword-stuff - integrate terms organically
+# End of a sentence, optionally followed by a closing quote/bracket, and then whitespace
+_SENTENCE_END_RE = re.compile(r'[.!?]["\')\]]?(?=\s)')
 
-5. **No hype, no filler, no spoilers:**
-   - Avoid dramatic or sensational language
-   - Don't oversell or use excessive adjectives
-   - Don't reveal major plot points
-   - Be accurate and truthful about the content
 
-6. **Style:**
-   - Clear, warm, confident tone
-   - Not dramatic or sensational
-   - One flowing paragraph (no bullet points)
-   - 500-1000 characters total
+# Audience / why-listen phrasing the enhanced descriptions carry (see SYSTEM_PROMPT)
+_CALL_TO_ACTION_RE = re.compile(
+    r"\b(listen(?:ers?|ing)?|tune in|perfect for|ideal for|fans of|whether you|invites you)\b", re.IGNORECASE
+)
 
-7. **Format:**
-   - Plain text only (no markdown, no **, no *)
-   - Do NOT include "Podcast Title:" or "Author:" prefixes
-   - Do NOT repeat the podcast title or author name unnecessarily
-   - Single paragraph - no line breaks
-   - NO URLs or links - write a clean description without any web addresses
-   - Be accurate to the actual content - don't make up details
 
-Write a polished description in a single flowing paragraph that accurately represents this content:"""
+def repair_locally(truncated_description: str, podcast_title: str, author: Optional[str] = None) -> Optional[str]:
+    """
+    Fix a long, already-enhanced truncated description without the LLM by cutting it back to its
+    last complete sentence. Returns None (the model is needed) when it has links, is outside the
+    LOCAL_REPAIR length range, has no call to action, or too little text would remain.
+    """
+    if not LOCAL_REPAIR_MIN_CHARS <= len(truncated_description) <= LOCAL_REPAIR_MAX_INPUT_CHARS:
+        return None
+    if has_links(truncated_description):
+        return None
+    text = cleanup_description(_prompt_base(truncated_description), podcast_title, author)
+    cut = 0
+    for match in _SENTENCE_END_RE.finditer(text, 0, LOCAL_REPAIR_MAX_CHARS + 1):
+        cut = match.end()
+    if cut < LOCAL_REPAIR_MIN_CHARS:
+        return None
+    repaired = text[:cut]
+    # The kept text must still say who it's for / why to listen, or it isn't worth keeping as-is
+    if not _CALL_TO_ACTION_RE.search(repaired):
+        return None
+    return repaired
+
+
+def build_completion_request(truncated_description: str, podcast_title: str, author: Optional[str] = None,
+                             temperature: float = TEMPERATURE, type_note: Optional[str] = None,
+                             model: str = MODEL) -> tuple[dict, str]:
+    """
+    Build the chat completion request for a truncated description.
+    type_note is the precomputed content type (see classify_page); it is derived here when omitted.
+    
+    Returns:
+        (request kwargs for chat.completions.create, user prompt)
+    """
+    # Check if description contains links - if so, rewrite completely from scratch
+    contains_links = has_links(truncated_description)
+    
+    if contains_links:
+        # If description has links, create completely new description from title/author only
+        console.print(f"[yellow]Found links in description - rewriting from scratch based on title/author[/yellow]")
+        base_description = ""  # Don't use the old description at all
+        use_existing = False
+    else:
+        # Remove the trailing "..." to get the base description
+        base_description = _prompt_base(truncated_description)
+        use_existing = True
+    
+    # Determine podcast type based on title and description
+    if type_note is None:
+        type_note = classify_podcast_type(podcast_title, base_description)
+    
+    # Only the variable data goes in the user message, so every request shares the system prompt as a cacheable prefix
+    details = "\n".join(filter(None, (f"Podcast Title: {podcast_title}", author and f"Author: {author}", f"Type: {type_note}")))
+    if use_existing:
+        # Complete existing truncated description
+        prompt = f"""Task: complete the truncated description.
+
+{details}
 
+Truncated description:
+{base_description}..."""
+    else:
+        # Create completely new description from title/author only
+        prompt = f"""Task: write a new description from the title and author.
+
+{details}"""
+
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+    max_tokens = 300  # 1000 characters is roughly 250 tokens, plus a small buffer
+    request = dict(model=model, messages=messages, temperature=temperature, max_tokens=max_tokens)
+    return request, prompt
+
+
+def finish_completion(content: str, podcast_title: str, author: Optional[str] = None) -> str:
+    """Turn raw model output into a clean, single-paragraph, 500-1000 character description."""
+    completed = content.strip()
+    
+    # Clean up common issues: remove markdown formatting and title/author prefixes
+    completed = cleanup_description(completed, podcast_title, author)
+    
+    # Ensure it doesn't end with "..."
+    completed = completed.rstrip('.').rstrip().rstrip('.')
+    if completed.endswith('...'):
+        completed = completed[:-3].rstrip()
+    
+    # Ensure single paragraph (remove line breaks, convert to single paragraph)
+    completed = ' '.join(completed.split())
+    
+    # Remove any URLs/links that might have been generated
+    completed = _HTTP_URL_RE.sub('', completed)
+    completed = _WWW_URL_RE.sub('', completed)
+    completed = ' '.join(completed.split())  # Clean up extra spaces
+    
+    # Validate length (500-1000 characters)
+    if len(completed) < 500:
+        # If too short, ask for a bit more detail
+        console.print(f"[yellow]Warning: Description is {len(completed)} chars (target: 500-1000). Regenerating...[/yellow]")
+        # Could regenerate here, but for now just note it
+    elif len(completed) > 1000:
+        # If too long, truncate intelligently (at sentence boundary if possible)
+        truncated = completed[:1000]
+        last_period = truncated.rfind('.')
+        if last_period > 800:  # Only truncate at sentence if we're close to the limit
+            completed = truncated[:last_period + 1]
+        else:
+            completed = truncated.rstrip() + '...'
+            console.print(f"[yellow]Warning: Description truncated to 1000 chars[/yellow]")
+    
+    return completed
+
+
+async def complete_description(truncated_description: str, podcast_title: str, author: Optional[str] = None,
+                               rate_limiter: Optional[RateLimiter] = None,
+                               cache: Optional[ResponseCache] = None,
+                               temperature: float = TEMPERATURE,
+                               type_note: Optional[str] = None,
+                               model: str = MODEL) -> str:
+    """
+    Complete a truncated description that ends in "...".
+    
+    Args:
+        truncated_description: The truncated description ending in "..."
+        podcast_title: The podcast title for context
+        author: Optional author name
+        rate_limiter: Optional limiter that paces requests to the account's RPM/TPM budget
+        cache: Optional response cache consulted before calling the API
+        temperature: Sampling temperature (0 for reproducible, cacheable output)
+        type_note: Precomputed content type, if the podcast was already classified
+        model: Chat model to use
+    
+    Returns:
+        Complete description
+    """
+    request, prompt = build_completion_request(truncated_description, podcast_title, author, temperature, type_note, model)
+    messages, max_tokens = request["messages"], request["max_tokens"]
+    
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert writer specializing in clear, warm, confident podcast descriptions. You write single-paragraph descriptions (500-1000 characters) that accurately reflect themes and tone, explain why someone would want to listen, state who it's for, and use SEO-friendly terms naturally. You avoid hype, filler, spoilers, and dramatic language. Your style is clear, warm, and confident - never sensational."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.7,
-            max_tokens=400  # 500-1000 characters is roughly 100-200 tokens, but allow more for safety
-        )
-        
-        completed = response.choices[0].message.content.strip()
-        
-        # Clean up common issues: remove markdown formatting and title/author prefixes
-        completed = cleanup_description(completed, podcast_title, author)
-        
-        # Ensure it doesn't end with "..."
-        completed = completed.rstrip('.').rstrip().rstrip('.')
-        if completed.endswith('...'):
-            completed = completed[:-3].rstrip()
-        
-        # Ensure single paragraph (remove line breaks, convert to single paragraph)
-        completed = ' '.join(completed.split())
+        content = None
+        embedding = None
+        if cache:
+            cache_key = ResponseCache.key(**request)
+            content = cache.get(cache_key)
+            if content is None and cache.semantic:
+                try:
+                    embedding = await cache.embed(prompt)
+                    content = cache.nearest(embedding)
+                except Exception as e:
+                    # A failed embedding is a semantic miss; the completion below still runs
+                    console.print(f"[yellow]Embedding request failed ({e.__class__.__name__}); skipping the semantic cache for {podcast_title[:50]}[/yellow]")
+                    embedding = None
         
-        # Remove any URLs/links that might have been generated
-        completed = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', completed)
-        completed = re.sub(r'www\.(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', completed)
-        completed = ' '.join(completed.split())  # Clean up extra spaces
-        
-        # Validate length (500-1000 characters)
-        if len(completed) < 500:
-            # If too short, ask for a bit more detail
-            console.print(f"[yellow]Warning: Description is {len(completed)} chars (target: 500-1000). Regenerating...[/yellow]")
-            # Could regenerate here, but for now just note it
-        elif len(completed) > 1000:
-            # If too long, truncate intelligently (at sentence boundary if possible)
-            truncated = completed[:1000]
-            last_period = truncated.rfind('.')
-            if last_period > 800:  # Only truncate at sentence if we're close to the limit
-                completed = truncated[:last_period + 1]
-            else:
-                completed = truncated.rstrip() + '...'
-                console.print(f"[yellow]Warning: Description truncated to 1000 chars[/yellow]")
+        if content is None:
+            estimated_tokens = estimate_tokens(messages, max_tokens)
+            if rate_limiter:
+                await rate_limiter.acquire(estimated_tokens)
+            
+            content, total_tokens = await stream_chat_completion(STREAM_MAX_CHARS, **request)
+            
+            # An early-stopped stream reports no usage; the estimate then stands
+            if rate_limiter and total_tokens:
+                rate_limiter.reconcile(estimated_tokens, total_tokens)
+            
+            if cache:
+                cache.set(cache_key, content, embedding)
         
-        return completed
+        return finish_completion(content, podcast_title, author)
         
     except Exception as e:
         console.print(f"[red]Error calling OpenAI API: {e}[/red]")
         raise
 
 
-def fetch_all_podcasts():
-    """Fetch all podcasts from Supabase with pagination."""
+def _shard_bounds(shards: int) -> list[tuple[Optional[str], Optional[str]]]:
+    """
+    Split the uuid keyspace into `shards` contiguous [lower, upper) id ranges.
+    Ids come from gen_random_uuid(), so the ranges hold roughly equal numbers of rows.
+    """
+    bounds = [f"{k * 2**32 // shards:08x}-0000-0000-0000-000000000000" for k in range(1, shards)]
+    return list(zip([None] + bounds, bounds + [None]))
+
+
+def _fetch_page(after_id: Optional[str], title: Optional[str] = None,
+                lower: Optional[str] = None, upper: Optional[str] = None) -> list[dict]:
+    """
+    Fetch the next PAGE_SIZE podcasts with truncated descriptions ordered by id,
+    starting after after_id (or at lower) and stopping before upper.
+    """
+    query = (
+        sb.table("podcasts")
+        .select(PODCAST_COLUMNS)
+        .filter("description", "match", TRUNCATED_PATTERN)
+        .order("id")
+        .limit(PAGE_SIZE)
+    )
+    if title:
+        # Loose match; the exact (stripped) comparison happens in iter_truncated_podcasts
+        query = query.filter("title", "match", r"^\s*" + re.escape(title.strip()) + r"\s*$")
+    if after_id is not None:
+        query = query.gt("id", after_id)
+    elif lower is not None:
+        query = query.gte("id", lower)
+    if upper is not None:
+        query = query.lt("id", upper)
+    result = query.execute()
+    return result.data or []
+
+
+def iter_podcast_pages(title: Optional[str] = None, lower: Optional[str] = None, upper: Optional[str] = None):
+    """
+    Yield podcasts with truncated descriptions from Supabase one page at a time, within an optional id range.
+    Keyset pagination on id keeps pages stable while this run is updating rows.
+    """
     try:
-        all_podcasts = []
-        page_size = 1000
-        offset = 0
-        
+        after_id = None
         while True:
-            # Fetch with limit and offset
-            result = sb.table("podcasts").select("id,title,author,description").range(offset, offset + page_size - 1).execute()
-            
-            if not result.data:
-                break
-                
-            all_podcasts.extend(result.data)
-            
-            # If we got fewer than page_size, we've reached the end
-            if len(result.data) < page_size:
-                break
-                
-            offset += page_size
-        
-        return all_podcasts
+            page = _fetch_page(after_id, title, lower, upper)
+            if not page:
+                return
+            yield page
+            if len(page) < PAGE_SIZE:
+                return
+            after_id = page[-1]["id"]
     except Exception as e:
         console.print(f"[red]Error fetching podcasts: {e}[/red]")
         raise
 
 
-def update_podcast_description(podcast_id: str, completed_description: str):
-    """Update podcast description in Supabase."""
+def _next_classified_page(pages) -> Optional[list[dict]]:
+    """Fetch the next page and classify it, both in the calling (worker) thread."""
+    page = next(pages, None)
+    return classify_page(page) if page is not None else None
+
+
+async def iter_truncated_podcasts(title: Optional[str] = None, limit: Optional[int] = None):
+    """
+    Stream podcasts with truncated descriptions (optionally only the one with this exact title).
+    FETCH_SHARDS id ranges are paged concurrently off the event loop, so processing starts with
+    the first page to arrive. Offset pages can't be fetched in parallel here: rows drop out of the
+    truncated filter as they're fixed, which would shift every later offset.
+    """
+    pages: asyncio.Queue = asyncio.Queue(maxsize=FETCH_SHARDS)
+    wanted_title = title.strip() if title else None
+    
+    async def walk(lower: Optional[str], upper: Optional[str]):
+        shard = iter_podcast_pages(title, lower, upper)
+        while (page := await asyncio.to_thread(_next_classified_page, shard)) is not None:
+            await pages.put(page)
+    
+    async def walk_all():
+        try:
+            await asyncio.gather(*(walk(lower, upper) for lower, upper in _shard_bounds(FETCH_SHARDS)))
+        finally:
+            await pages.put(None)
+    
+    fetcher = asyncio.create_task(walk_all())
+    found = 0
+    try:
+        while (page := await pages.get()) is not None:
+            for podcast in page:
+                if not is_truncated(podcast.get("description") or ""):
+                    continue
+                if wanted_title and podcast.get("title", "").strip() != wanted_title:
+                    continue
+                yield podcast
+                found += 1
+                if limit and found >= limit:
+                    return
+        # Surface any fetch error
+        await fetcher
+    finally:
+        fetcher.cancel()
+
+
+def fetch_podcasts_by_id(podcast_ids: list[str]) -> list[dict]:
+    """Fetch specific podcasts, a few hundred ids per request to keep the URL short."""
+    podcasts = []
+    for start in range(0, len(podcast_ids), 200):
+        result = sb.table("podcasts").select(PODCAST_COLUMNS).in_("id", podcast_ids[start:start + 200]).execute()
+        podcasts.extend(result.data or [])
+    return podcasts
+
+
+def update_podcast_descriptions(changes: list[dict]):
+    """
+    Write a batch of completed descriptions to Supabase in a single upsert.
+    Each row carries feed_url because the insert half of the upsert must satisfy its NOT NULL constraint.
+    """
+    if not changes:
+        return []
     try:
-        result = sb.table("podcasts").update({
-            "description": completed_description
-        }).eq("id", podcast_id).execute()
-        return result.data[0] if result.data else None
+        result = sb.table("podcasts").upsert(changes, on_conflict="id").execute()
+        return result.data or []
     except Exception as e:
-        console.print(f"[red]Error updating podcast: {e}[/red]")
+        console.print(f"[red]Error updating podcasts: {e}[/red]")
         raise
 
 
+def replay_checkpoint() -> int:
+    """Write any completions left in the checkpoint by an interrupted run, then remove it."""
+    if not os.path.exists(CHECKPOINT_PATH):
+        return 0
+    with open(CHECKPOINT_PATH) as f:
+        # Later lines win if a row was checkpointed twice
+        changes = list({row["id"]: row for row in map(json.loads, filter(str.strip, f))}.values())
+    for start in range(0, len(changes), UPDATE_BATCH_SIZE):
+        update_podcast_descriptions(changes[start:start + UPDATE_BATCH_SIZE])
+    os.remove(CHECKPOINT_PATH)
+    return len(changes)
+
+
+async def submit_batch(requests: list[tuple[str, dict]]) -> str:
+    """Upload (custom_id, request) pairs as a Batch API input file and start the batch. Returns the batch id."""
+    lines = [
+        json.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": request})
+        for custom_id, request in requests
+    ]
+    input_file = await openai_client.files.create(
+        file=(os.path.basename(BATCH_INPUT_PATH), ("\n".join(lines) + "\n").encode()),
+        purpose="batch",
+    )
+    batch = await openai_client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    return batch.id
+
+
+async def wait_for_batch(batch_id: str):
+    """Poll a batch until it reaches a terminal status."""
+    while True:
+        batch = await openai_client.batches.retrieve(batch_id)
+        if batch.status in ("completed", "failed", "expired", "cancelled"):
+            return batch
+        counts = batch.request_counts
+        done = f" ({counts.completed + counts.failed}/{counts.total})" if counts else ""
+        console.print(f"[dim]Batch {batch_id}: {batch.status}{done}[/dim]")
+        await asyncio.sleep(BATCH_POLL_INTERVAL)
+
+
+async def download_batch_results(batch) -> dict[str, str]:
+    """Map custom_id -> completion text for every successful request in a finished batch."""
+    results = {}
+    if not batch.output_file_id:
+        return results
+    output = await openai_client.files.content(batch.output_file_id)
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        response = item.get("response") or {}
+        if response.get("status_code") == 200:
+            results[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        else:
+            console.print(f"[red]Batch request {item['custom_id']} failed: {item.get('error') or response.get('body')}[/red]")
+    return results
+
+
+async def run_batch(truncated_podcasts: list[dict], args,
+                    temperature: float, cache: Optional[ResponseCache]) -> tuple[int, int, int]:
+    """
+    Complete descriptions through the Batch API instead of real-time requests.
+    With --batch-id, collects the results of batches submitted by an earlier run.
+    
+    Returns:
+        (updated, errors, repaired locally)
+    """
+    contents: dict[str, str] = {}
+    submitted: dict[str, dict] = {}
+    changes = []
+    
+    if args.batch_id:
+        batch_ids = [batch_id.strip() for batch_id in args.batch_id.split(",") if batch_id.strip()]
+        expected = None
+    else:
+        for podcast in truncated_podcasts:
+            description = podcast.get("description", "").strip()
+            title = podcast.get("title", "Unknown")
+            repaired = repair_locally(description, title, podcast.get("author")) if args.local_repair else None
+            if repaired is not None:
+                changes.append({"id": podcast["id"], "feed_url": podcast.get("feed_url"), "description": repaired})
+                continue
+            request, _ = build_completion_request(
+                description, title, podcast.get("author"), temperature, podcast.get("_type_note"), args.model
+            )
+            cached = cache.get(ResponseCache.key(**request)) if cache else None
+            if cached is not None:
+                contents[podcast["id"]] = cached
+            else:
+                submitted[podcast["id"]] = request
+        expected = len(truncated_podcasts)
+        
+        if args.dry_run:
+            with open(BATCH_INPUT_PATH, "w") as f:
+                for custom_id, request in submitted.items():
+                    f.write(json.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": request}) + "\n")
+            console.print(f"[yellow]Wrote {len(submitted)} batch request(s) to {BATCH_INPUT_PATH} without submitting[/yellow]")
+            return 0, 0, len(changes)
+        
+        items = list(submitted.items())
+        batch_ids = [
+            await submit_batch(items[start:start + BATCH_MAX_REQUESTS])
+            for start in range(0, len(items), BATCH_MAX_REQUESTS)
+        ]
+        if batch_ids:
+            console.print(f"[green]Submitted {len(items)} request(s) as batch(es): {', '.join(batch_ids)}[/green]")
+            console.print(f"[dim]If interrupted, collect later with --batch-id {','.join(batch_ids)}[/dim]")
+    
+    for batch_id in batch_ids:
+        batch = await wait_for_batch(batch_id)
+        if batch.status != "completed":
+            console.print(f"[red]Batch {batch_id} ended with status {batch.status}[/red]")
+        contents.update(await download_batch_results(batch))
+    
+    if args.batch_id:
+        podcasts_by_id = {p["id"]: p for p in await asyncio.to_thread(fetch_podcasts_by_id, list(contents))}
+    else:
+        podcasts_by_id = {p["id"]: p for p in truncated_podcasts}
+    
+    local_repairs = len(changes)
+    for podcast_id, content in contents.items():
+        podcast = podcasts_by_id.get(podcast_id)
+        if not podcast:
+            continue
+        if cache and podcast_id in submitted:
+            cache.set(ResponseCache.key(**submitted[podcast_id]), content)
+        title = podcast.get("title", "Unknown")
+        completed = finish_completion(content, title, podcast.get("author"))
+        changes.append({"id": podcast_id, "feed_url": podcast.get("feed_url"), "description": completed})
+    
+    errors = (expected if expected is not None else len(changes)) - len(changes)
+    if args.dry_run:
+        for row in changes[:3]:
+            console.print(f"[green]{row['id']}: {row['description'][:150]}...[/green]")
+        return 0, errors, local_repairs
+    
+    updated = 0
+    for start in range(0, len(changes), UPDATE_BATCH_SIZE):
+        batch_changes = changes[start:start + UPDATE_BATCH_SIZE]
+        try:
+            update_podcast_descriptions(batch_changes)
+            updated += len(batch_changes)
+        except Exception:
+            errors += len(batch_changes)
+    return updated, errors, local_repairs
+
+
+def print_summary(total: int, updated: int, errors: int, cache: Optional[ResponseCache], dry_run: bool, repaired: int = 0):
+    console.print("\n" + "="*60)
+    console.print(Panel.fit(
+        f"[bold]Summary[/bold]\n\n"
+        f"Total truncated descriptions found: {total}\n"
+        f"[green]Updated: {updated}[/green]\n"
+        f"[cyan]Repaired locally (no API call): {repaired}[/cyan]\n"
+        f"[cyan]Cache hits: {(cache.hits + cache.semantic_hits) if cache else 0}[/cyan]\n"
+        f"[red]Errors: {errors}[/red]",
+        border_style="cyan"
+    ))
+    
+    if dry_run:
+        console.print("\n[yellow]This was a dry run. No changes were saved.[/yellow]")
+        console.print("[yellow]Run without --dry-run to apply changes.[/yellow]")
+
+
 def is_truncated(description: str) -> bool:
     """
     Check if a description ends with "..." (truncated).
@@ -399,11 +1045,27 @@ def is_truncated(description: str) -> bool:
     return description.endswith('...') or description.rstrip().endswith('...')
 
 
-def main():
+async def main():
     parser = argparse.ArgumentParser(description="Fix truncated podcast descriptions ending in '...'")
     parser.add_argument("--dry-run", action="store_true", help="Preview changes without updating")
     parser.add_argument("--limit", type=int, help="Only process first N podcasts (for testing)")
     parser.add_argument("--title", type=str, help="Only process podcast with this exact title")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="Maximum OpenAI requests in flight at once")
+    parser.add_argument("--max-rpm", type=int, default=MAX_REQUESTS_PER_MINUTE, help="OpenAI requests-per-minute limit")
+    parser.add_argument("--max-tpm", type=int, default=MAX_TOKENS_PER_MINUTE, help="OpenAI tokens-per-minute limit")
+    parser.add_argument("--model", type=str, default=MODEL, help="OpenAI chat model for completions")
+    parser.add_argument("--local-repair", action="store_true",
+                        help=f"Skip the model for already-enhanced {LOCAL_REPAIR_MIN_CHARS}-{LOCAL_REPAIR_MAX_INPUT_CHARS} character descriptions "
+                             f"that can be cut back to a complete sentence of {LOCAL_REPAIR_MIN_CHARS}+ characters")
+    parser.add_argument("--creative", action="store_true",
+                        help=f"Sample at temperature {CREATIVE_TEMPERATURE} instead of {TEMPERATURE} (for regenerating descriptions)")
+    parser.add_argument("--no-cache", action="store_true", help="Always call OpenAI, ignoring the local response cache")
+    parser.add_argument("--semantic-cache", action="store_true",
+                        help=f"Also reuse responses for near-duplicate prompts (embedding cosine >= {SEMANTIC_CACHE_THRESHOLD})")
+    parser.add_argument("--batch", action="store_true",
+                        help="Use the OpenAI Batch API (50%% cheaper, results within 24h) instead of real-time requests")
+    parser.add_argument("--batch-id", type=str,
+                        help="Collect and apply the results of batch(es) submitted earlier (comma-separated ids)")
     args = parser.parse_args()
     
     console.print(Panel.fit(
@@ -415,55 +1077,53 @@ def main():
     if args.dry_run:
         console.print("[yellow]DRY RUN MODE: No changes will be saved[/yellow]\n")
     
-    # Fetch all podcasts
-    console.print("[cyan]Fetching podcasts from Supabase...[/cyan]")
-    podcasts = fetch_all_podcasts()
+    if not args.dry_run:
+        replayed = replay_checkpoint()
+        if replayed:
+            console.print(f"[green]Wrote {replayed} completion(s) saved by an interrupted run[/green]\n")
     
-    if not podcasts:
-        console.print("[yellow]No podcasts found[/yellow]")
-        return
-    
-    # Filter for truncated descriptions
-    truncated_podcasts = [
-        p for p in podcasts 
-        if p.get("description") and is_truncated(p.get("description", ""))
-    ]
-    
-    # Filter by title if specified
-    if args.title:
-        truncated_podcasts = [
-            p for p in truncated_podcasts 
-            if p.get("title", "").strip() == args.title.strip()
-        ]
-        if not truncated_podcasts:
-            console.print(f"[yellow]No podcast found with title: '{args.title}'[/yellow]")
-            console.print("[yellow]Or it doesn't have a truncated description.[/yellow]")
-            return
-    
-    if args.limit:
-        truncated_podcasts = truncated_podcasts[:args.limit]
-    
-    total = len(truncated_podcasts)
-    console.print(f"[green]Found {total} podcast(s) with truncated descriptions[/green]\n")
+    cache = None if args.no_cache else ResponseCache(semantic=args.semantic_cache)
+    temperature = CREATIVE_TEMPERATURE if args.creative else TEMPERATURE
     
-    if total == 0:
-        console.print("[yellow]No truncated descriptions found[/yellow]")
+    if args.batch or args.batch_id:
+        # Submitting a batch needs every request up front
+        truncated_podcasts = [] if args.batch_id else [p async for p in iter_truncated_podcasts(args.title, args.limit)]
+        total = len(truncated_podcasts)
+        if not args.batch_id:
+            console.print(f"[green]Found {total} podcast(s) with truncated descriptions[/green]\n")
+        updated, errors, repaired = await run_batch(truncated_podcasts, args, temperature, cache)
+        await openai_client.close()
+        if cache:
+            cache.close()
+        print_summary(total, updated, errors, cache, args.dry_run, repaired)
         return
     
-    # Show some examples
-    console.print("[cyan]Examples of truncated descriptions:[/cyan]")
-    for i, podcast in enumerate(truncated_podcasts[:3]):
-        desc = podcast.get("description", "")
-        console.print(f"  {i+1}. {podcast.get('title', 'Unknown')[:60]}")
-        console.print(f"     {desc[:100]}...")
-    if total > 3:
-        console.print(f"     ... and {total - 3} more\n")
-    else:
-        console.print()
-    
-    # Process podcasts
+    # Process podcasts as pages stream in from Supabase
+    console.print("[cyan]Streaming podcasts from Supabase...[/cyan]")
+    workers = max(1, args.concurrency)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    total = 0
     updated = 0
     errors = 0
+    repaired = 0
+    pending: list[dict] = []
+    unwritten = 0
+    checkpoint = None if args.dry_run else open(CHECKPOINT_PATH, "a")
+    
+    async def flush_pending():
+        nonlocal updated, errors, unwritten
+        if not pending:
+            return
+        batch = pending[:]
+        pending.clear()
+        try:
+            # The Supabase client is synchronous, so keep it off the event loop
+            await asyncio.to_thread(update_podcast_descriptions, batch)
+            updated += len(batch)
+        except Exception:
+            # Rows stay in the checkpoint and are written on the next run
+            errors += len(batch)
+            unwritten += len(batch)
     
     with Progress(
         SpinnerColumn(),
@@ -476,9 +1136,12 @@ def main():
         console=console,
         expand=True
     ) as progress:
-        task = progress.add_task("[bold green]Processing podcasts...", total=total)
+        # The total grows as truncated descriptions are found
+        task = progress.add_task("[bold green]Processing podcasts...", total=None)
+        rate_limiter = RateLimiter(args.max_rpm, args.max_tpm)
         
-        for i, podcast in enumerate(truncated_podcasts):
+        async def process_podcast(i: int, podcast: dict):
+            nonlocal errors, repaired
             podcast_id = podcast.get("id")
             title = podcast.get("title", "Unknown")
             author = podcast.get("author")
@@ -488,7 +1151,14 @@ def main():
                 progress.update(task, description=f"[bold green]Processing: {title[:50]}...")
                 
                 # Complete the description
-                completed = complete_description(truncated_description, title, author)
+                completed = repair_locally(truncated_description, title, author) if args.local_repair else None
+                if completed is not None:
+                    repaired += 1
+                else:
+                    completed = await complete_description(
+                        truncated_description, title, author, rate_limiter, cache, temperature,
+                        podcast.get("_type_note"), args.model
+                    )
                 
                 # Show preview for first few or in dry-run mode
                 if i < 3 or args.dry_run:
@@ -496,39 +1166,64 @@ def main():
                     console.print(f"[dim]Original ({len(truncated_description)} chars): {truncated_description[:80]}...[/dim]")
                     console.print(f"[green]New ({len(completed)} chars): {completed[:150]}...[/green]\n")
                 
-                # Update Supabase (unless dry-run)
+                # Queue the update (unless dry-run); it is checkpointed until its batch is written
                 if not args.dry_run:
-                    update_podcast_description(podcast_id, completed)
-                    updated += 1
-                    progress.update(task, description=f"[bold green]✓ Updated: {title[:50]}...")
+                    row = {"id": podcast_id, "feed_url": podcast.get("feed_url"), "description": completed}
+                    checkpoint.write(json.dumps(row) + "\n")
+                    checkpoint.flush()
+                    pending.append(row)
+                    if len(pending) >= UPDATE_BATCH_SIZE:
+                        await flush_pending()
+                    progress.update(task, description=f"[bold green]✓ Completed: {title[:50]}...")
                 else:
                     progress.update(task, description=f"[yellow]Preview: {title[:50]}...")
                 
-                # Rate limiting
-                time.sleep(API_DELAY)
-                
             except Exception as e:
                 errors += 1
                 progress.update(task, description=f"[red]✗ Error: {title[:50]}...")
                 console.print(f"[red]Error processing {title}: {e}[/red]")
             
             progress.advance(task)
+        
+        async def produce():
+            nonlocal total
+            try:
+                async for podcast in iter_truncated_podcasts(args.title, args.limit):
+                    await queue.put((total, podcast))
+                    total += 1
+                    progress.update(task, total=total)
+            finally:
+                # One sentinel per worker so they all stop once the stream is exhausted
+                for _ in range(workers):
+                    await queue.put(None)
+        
+        async def worker():
+            while (item := await queue.get()) is not None:
+                await process_podcast(*item)
+        
+        await asyncio.gather(produce(), *(worker() for _ in range(workers)))
+        await flush_pending()
     
-    # Summary
-    console.print("\n" + "="*60)
-    console.print(Panel.fit(
-        f"[bold]Summary[/bold]\n\n"
-        f"Total truncated descriptions found: {total}\n"
-        f"[green]Updated: {updated}[/green]\n"
-        f"[red]Errors: {errors}[/red]",
-        border_style="cyan"
-    ))
+    if checkpoint:
+        checkpoint.close()
+        # A failed batch keeps the checkpoint so the next run can write it
+        if not unwritten:
+            os.remove(CHECKPOINT_PATH)
+    await openai_client.close()
+    if cache:
+        cache.close()
     
-    if args.dry_run:
-        console.print("\n[yellow]This was a dry run. No changes were saved.[/yellow]")
-        console.print("[yellow]Run without --dry-run to apply changes.[/yellow]")
+    if total == 0:
+        if args.title:
+            console.print(f"[yellow]No podcast found with title: '{args.title}'[/yellow]")
+            console.print("[yellow]Or it doesn't have a truncated description.[/yellow]")
+        else:
+            console.print("[yellow]No truncated descriptions found[/yellow]")
+        return
+    
+    print_summary(total, updated, errors, cache, args.dry_run, repaired)
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
 
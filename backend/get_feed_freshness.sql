@@ -0,0 +1,23 @@
+-- Function: get_feed_freshness(urls text[])
+-- Used by feed_ingestor.py (REFRESH_ACTIVE_ONLY) to get the latest episode date for every CSV feed
+-- in one call instead of batched podcasts lookups plus per-podcast max(pub_date) aggregates.
+-- Returns one row per known feed_url; latest is null for podcasts without dated episodes.
+-- Feeds not in the database are not returned (the ingestor treats them as new).
+-- Run this in Supabase SQL Editor once.
+
+create or replace function public.get_feed_freshness(urls text[])
+returns table (feed_url text, latest timestamptz)
+language sql
+stable
+set search_path = public
+as $$
+  -- max() per podcast is answered from idx_episodes_podcast_pub (podcast_id, pub_date desc)
+  select p.feed_url,
+         (select max(e.pub_date) from public.episodes e where e.podcast_id = p.id) as latest
+  from public.podcasts p
+  where p.feed_url = any(urls);
+$$;
+
+-- Only the service role (backend scripts) may call it
+revoke all on function public.get_feed_freshness(text[]) from public, anon, authenticated;
+grant execute on function public.get_feed_freshness(text[]) to service_role;
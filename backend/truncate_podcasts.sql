@@ -0,0 +1,19 @@
+-- Function: truncate_podcasts()
+-- Used by delete_podcast.py --all to wipe every podcast in O(1) instead of a row-by-row DELETE.
+-- TRUNCATE ... CASCADE also empties episodes (and anything else referencing podcasts).
+-- Run this in Supabase SQL Editor once.
+
+create or replace function public.truncate_podcasts()
+returns void
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  truncate table public.podcasts restart identity cascade;
+end;
+$$;
+
+-- Only the service role (backend scripts) may call it
+revoke all on function public.truncate_podcasts() from public, anon, authenticated;
+grant execute on function public.truncate_podcasts() to service_role;